@@ -0,0 +1,96 @@
+# 처리율 제한 미들웨어 구현 방식별 health check("/") 처리량 비교
+# 실행: PYTHONPATH=./ python locust-test/benchmark_rate_limit.py (REDIS_URL의 Redis 필요)
+# 결과는 측정 환경(Redis 버전/위치, 동시성)에 따라 달라지므로 출력 첫 줄의 환경과 함께 기록한다
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from src.apis.common import router as common_router
+from src.config import config
+from src.database import redis
+from src.middlewares.rate_limit import (
+    BucketRateLimitMiddleware,
+    rate_limit_policies,
+    token_bucket_script,
+)
+
+
+# 비교용: 이전 BaseHTTPMiddleware 방식. 토큰 계산(Lua 스크립트)은 동일
+class BaseHTTPBucketRateLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        client_ip = request.client.host  # type: ignore
+        _, tokens, retry_after = await token_bucket_script(
+            keys=[f"bucket:{client_ip}"],
+            args=[config.REQUESTS_PER_MINUTE / 60, config.BUCKET_SIZE, time.time(), 1],
+        )
+        response: Response = await call_next(request)
+        response.headers.append("X-Ratelimit-Remaining", str(int(float(tokens))))
+        response.headers.append("X-Ratelimit-Limit", str(config.BUCKET_SIZE))
+        response.headers.append("X-Ratelimit-Retry-After", str(retry_after))
+        return response
+
+
+def create_app(middleware: type | None) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router=common_router)
+    if middleware:
+        app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = ASGITransport(app=app)  # type: ignore
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.get("/")
+                assert response.status_code == 200
+
+        started_at = time.perf_counter()
+        await asyncio.gather(
+            *[worker(requests // concurrency) for _ in range(concurrency)]
+        )
+        elapsed = time.perf_counter() - started_at
+
+    return (requests // concurrency * concurrency) / elapsed
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # 측정 중 처리율 제한에 걸리지 않도록 버킷을 충분히 크게 설정
+    config.REQUESTS_PER_MINUTE = 60 * 1_000_000
+    config.BUCKET_SIZE = float(requests * 10)
+    # 미들웨어는 import 시점에 만든 정책을 사용하므로 바뀐 설정으로 다시 만든다
+    rate_limit_policies.reload()
+
+    server = await redis.info("server")
+    print(
+        f"redis {server['redis_version']} ({config.REDIS_URL}), "
+        f"requests={requests}, concurrency={concurrency}"
+    )
+    targets = {
+        "no middleware": None,
+        "BaseHTTPMiddleware": BaseHTTPBucketRateLimitMiddleware,
+        "pure ASGI": BucketRateLimitMiddleware,
+    }
+    for name, middleware in targets.items():
+        app = create_app(middleware)
+        await measure(
+            app, requests=concurrency * 10, concurrency=concurrency
+        )  # warm up
+        requests_per_second = await measure(app, requests, concurrency)
+        print(f"{name:<20} {requests_per_second:>10.1f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(requests=args.requests, concurrency=args.concurrency))
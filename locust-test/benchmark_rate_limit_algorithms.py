@@ -0,0 +1,71 @@
+# 처리율 제한 알고리즘별 클라이언트당 Redis 메모리, 요청당 Redis 명령 수, 처리량 비교
+# 실행: PYTHONPATH=./ python locust-test/benchmark_rate_limit_algorithms.py (REDIS_URL의 Redis 필요)
+import argparse
+import asyncio
+import time
+
+from src.config import config
+from src.database import redis
+from src.middlewares.rate_limit import RATE_LIMIT_ALGORITHMS
+
+# 스크립트 실행 외에 측정에 쓰는 명령은 집계에서 제외
+EXCLUDED_COMMANDS = {"evalsha", "eval", "script", "info", "memory", "scan", "unlink"}
+
+
+async def count_commands() -> int:
+    stats = await redis.info("commandstats")
+    return sum(
+        stat["calls"]
+        for name, stat in stats.items()
+        if name.removeprefix("cmdstat_").split("|")[0] not in EXCLUDED_COMMANDS
+    )
+
+
+async def delete_keys(pattern: str) -> None:
+    keys = [key async for key in redis.scan_iter(match=pattern, count=1000)]
+    for index in range(0, len(keys), 1000):
+        await redis.unlink(*keys[index : index + 1000])
+
+
+async def measure(algorithm: str, clients: int, requests: int) -> None:
+    script, _ = RATE_LIMIT_ALGORITHMS[algorithm]
+    rate = config.REQUESTS_PER_MINUTE / 60
+    keys = [f"benchmark:{algorithm}:{client}" for client in range(clients)]
+    await delete_keys(f"benchmark:{algorithm}:*")
+
+    commands = await count_commands()
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        await asyncio.gather(
+            *[
+                script(keys=[key], args=[rate, config.BUCKET_SIZE, time.time(), 1])
+                for key in keys
+            ]
+        )
+    elapsed = time.perf_counter() - started_at
+    total = clients * requests
+    commands = await count_commands() - commands
+
+    sample = keys[:: max(1, clients // 100)]
+    memory = [await redis.memory_usage(key) or 0 for key in sample]
+    await delete_keys(f"benchmark:{algorithm}:*")
+
+    print(
+        f"{algorithm:<16}"
+        f"{sum(memory) / len(memory):>12.1f} bytes/client"
+        f"{commands / total:>12.2f} ops/request"
+        f"{total / elapsed:>12.1f} req/s"
+    )
+
+
+async def main(clients: int, requests: int) -> None:
+    for algorithm in RATE_LIMIT_ALGORITHMS:
+        await measure(algorithm, clients, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(clients=args.clients, requests=args.requests))
@@ -1,11 +1,13 @@
-import json
+from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from redis.asyncio import Redis
 
 from src.auth import get_current_user
+from src.cache import get_or_set, invalidate_namespace
 from src.database import get_redis
 from src.domains.user import Role
+from src.pagination import decode_cursor, encode_cursor
 from src.schemas.auth import SessionContent
 from src.schemas.comment import (
     CommentResponse,
@@ -14,6 +16,7 @@ from src.schemas.comment import (
     CreateCommentResponse,
     EditComment,
 )
+from src.schemas.common import Link
 from src.servicies.comment import CommentService
 from src.servicies.post import PostService
 
@@ -34,7 +37,7 @@ async def create_comment(
 ) -> CreateCommentResponse:
     user_id = current_user.id
 
-    post = await post_service.get_post(request.post_id)
+    post = await post_service.get_post(request.post_id, primary=True)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
@@ -54,7 +57,9 @@ async def create_comment(
     )
 
     try:
-        await redis.delete("comments:*")
+        await invalidate_namespace(redis, "comments")
+        # 포스트 목록의 댓글 수도 바뀐다
+        await invalidate_namespace(redis, "posts")
     except:
         pass
 
@@ -70,39 +75,61 @@ async def get_comments(
     post_id: int | None = None,
     user_id: int | None = None,
     page: int = Query(1),
+    cursor: str | None = Query(None),
     redis: Redis = Depends(get_redis),
     service: CommentService = Depends(CommentService),
 ) -> CommentsResponse:
-    cache_key = f"comments:post_id:{post_id}:user_id:{user_id}:page:{page}"
-    try:
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            return CommentsResponse(**json.loads(cached_data))
-    except:
-        pass
+    decoded_cursor = decode_cursor(cursor) if cursor else None
+    cache_key = f"post_id:{post_id}:user_id:{user_id}:" + (
+        f"cursor:{cursor}" if cursor else f"page:{page}"
+    )
 
-    comments = await service.get_comments(post_id=post_id, user_id=user_id, page=page)
-    response = CommentsResponse(
-        comments=[
-            CommentResponse(
-                id=comment.id,  # type: ignore
-                post_id=comment.post_id,
-                author_id=comment.author_id,
-                content=comment.content,
-                created_at=comment.created_at,
-                updated_at=comment.updated_at,
+    async def load_comments() -> dict:
+        # 캐시는 TTL 동안 모두에게 응답되므로 replica 지연이 남지 않도록 primary에서 조회
+        comments = await service.get_comments(
+            post_id=post_id,
+            user_id=user_id,
+            page=page,
+            cursor=decoded_cursor,
+            primary=True,
+        )
+
+        filter_params = {
+            key: value
+            for key, value in (("post_id", post_id), ("user_id", user_id))
+            if value
+        }
+        links = [Link(href="/comments", rel="self", method="GET")]
+        # 마지막 댓글 기준 다음 페이지 커서
+        if len(comments) == service.items_per_page:
+            next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)  # type: ignore
+            next_params = urlencode({**filter_params, "cursor": next_cursor})
+            links.append(
+                Link(href=f"/comments?{next_params}", rel="next", method="GET")
             )
-            for comment in comments
-        ]
-    )
-    try:
-        await redis.setex(
-            name=cache_key, time=3600, value=json.dumps(response.model_dump())
+
+        response = CommentsResponse(
+            comments=[
+                CommentResponse(
+                    id=comment.id,  # type: ignore
+                    post_id=comment.post_id,
+                    author_id=comment.author_id,
+                    content=comment.content,
+                    created_at=comment.created_at,
+                    updated_at=comment.updated_at,
+                )
+                for comment in comments
+            ],
+            links=links,
         )
-    except:
-        pass
+        return response.model_dump(mode="json")
 
-    return response
+    # 캐시 만료시 동시 요청이 DB로 몰리지 않도록 get_or_set으로 조회
+    comments_data = await get_or_set(
+        redis=redis, key=cache_key, loader=load_comments, namespace="comments"
+    )
+
+    return CommentsResponse(**comments_data)
 
 
 @router.patch("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -130,7 +157,7 @@ async def edit_comment(
     await service.edit_comment(comment=comment, content=request.content)
 
     try:
-        await redis.delete("comments:*")
+        await invalidate_namespace(redis, "comments")
     except:
         pass
 
@@ -161,6 +188,8 @@ async def delete_comment(
     await service.delete_comment(comment)
 
     try:
-        await redis.delete("comments:*")
+        await invalidate_namespace(redis, "comments")
+        # 포스트 목록의 댓글 수도 바뀐다
+        await invalidate_namespace(redis, "posts")
     except:
         pass
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, status
 
+from src.auth import password_hash_metrics
 from src.config import config
-from src.database import consistent_hash
+from src.runtime_config import update_runtime_config
 from src.schemas.common import EditRateLimitRequest
 
 router = APIRouter(tags=["common"])
@@ -18,12 +19,21 @@ async def health() -> None:
     return
 
 
+# 워커별 지표
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+async def metrics():
+    return {"password_hash": password_hash_metrics.to_dict()}
+
+
+# 변경된 설정은 모든 워커에 전파된다
 @router.patch("/update_rate_limit", status_code=status.HTTP_200_OK)
 async def update_rate_limit(request: EditRateLimitRequest):
-    if request.requests_per_minute:
-        config.REQUESTS_PER_MINUTE = request.requests_per_minute
-    if request.bucket_size:
-        config.BUCKET_SIZE = float(request.bucket_size)
+    await update_runtime_config(
+        {
+            "REQUESTS_PER_MINUTE": request.requests_per_minute,
+            "BUCKET_SIZE": request.bucket_size,
+        }
+    )
 
     return {
         "message": f"REQUESTS_PER_MINUTE={config.REQUESTS_PER_MINUTE}, BUCKET_SIZE={config.BUCKET_SIZE}"
@@ -32,5 +42,5 @@ async def update_rate_limit(request: EditRateLimitRequest):
 
 @router.post("/set_virtual_nodes")
 async def set_virtual_nodes(virtual_nodes: int):
-    consistent_hash.set_virtual_nodes(virtual_nodes)
+    await update_runtime_config({"VIRTUAL_NODES": virtual_nodes})
     return {"message": f"Virtual nodes set to {virtual_nodes}"}
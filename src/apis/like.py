@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import AsyncIterator
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 
 from src.auth import get_current_user
+from src.cache import invalidate_namespace
+from src.database import get_redis
+from src.pagination import decode_cursor, encode_cursor
 from src.schemas.auth import SessionContent
+from src.schemas.common import Link
 from src.schemas.like import (
     CreateLikeRequest,
     CreateLikeResponse,
@@ -9,7 +20,6 @@ from src.schemas.like import (
     LikeUserResponse,
 )
 from src.servicies.like import LikeService, LikeServiceBase
-from src.servicies.notification import NotificationService, NotificationServiceBase
 from src.servicies.post import PostService
 
 router = APIRouter(prefix="/likes", tags=["likes"])
@@ -24,28 +34,33 @@ async def create_like(
     request: CreateLikeRequest,
     like_service: LikeServiceBase = Depends(LikeService),
     post_service: PostService = Depends(PostService),
-    notification_service: NotificationServiceBase = Depends(NotificationService),
+    redis: Redis = Depends(get_redis),
     current_user: SessionContent = Depends(get_current_user),
 ) -> CreateLikeResponse:
     user_id = current_user.id
 
-    post = await post_service.get_post(request.post_id)
+    post = await post_service.get_post(request.post_id, primary=True)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
         )
 
-    # author_id = post.author_id
-    like = await like_service.get_like_by_user_and_post(
-        user_id=user_id, post_id=request.post_id
-    )
-    if like:
+    # 좋아요와 포스트 작성자 알림을 한 트랜잭션으로 추가
+    try:
+        new_like = await like_service.create_like(
+            user_id=user_id, post_id=request.post_id, target_user_id=post.author_id
+        )
+    except IntegrityError:
+        # 조회 후 좋아요 추가 전에 포스트가 삭제된 경우 외래키에서 거절
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
+        )
+    if not new_like:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 좋아요 한 포스트입니다",
         )
 
-    new_like = await like_service.create_like(user_id=user_id, post_id=request.post_id)
     response = CreateLikeResponse(
         id=new_like.id,  # type: ignore
         user_id=new_like.user_id,
@@ -53,9 +68,11 @@ async def create_like(
         created_at=new_like.created_at,
     )
 
-    await notification_service.create_notification(
-        user_id=post.author_id, actor_user_id=user_id, post_id=request.post_id
-    )
+    # 포스트 목록의 좋아요 수가 바뀐다
+    try:
+        await invalidate_namespace(redis, "posts")
+    except:
+        pass
 
     return response
 
@@ -67,9 +84,11 @@ async def create_like(
 )
 async def get_liked_users(
     post_id: int | None = None,
+    cursor: str | None = Query(None),
+    stream: bool = Query(False),
     like_service: LikeServiceBase = Depends(LikeService),
     post_service: PostService = Depends(PostService),
-) -> GetLikeUsersResponse:
+) -> GetLikeUsersResponse | StreamingResponse:
     if post_id:
         post = await post_service.get_post(post_id)
         if not post:
@@ -78,27 +97,51 @@ async def get_liked_users(
                 detail="존재하지 않는 포스트입니다",
             )
 
-    users = await like_service.get_liked_users(post_id=post_id)
+    # 전체 목록을 메모리에 만들지 않고 DB에서 읽는 대로 한 줄씩 NDJSON 응답
+    if stream:
+
+        async def generate_users() -> AsyncIterator[str]:
+            async for like_user in like_service.stream_liked_users(post_id=post_id):
+                yield to_like_user_response(like_user).model_dump_json() + "\n"
+
+        return StreamingResponse(generate_users(), media_type="application/x-ndjson")
+
+    decoded_cursor = decode_cursor(cursor) if cursor else None
+    like_users = await like_service.get_liked_users(
+        post_id=post_id, cursor=decoded_cursor
+    )
+
+    filter_params = {"post_id": post_id} if post_id else {}
+    links = [Link(href="/likes", rel="self", method="GET")]
+    # 마지막 좋아요 기준 다음 페이지 커서
+    if len(like_users) == like_service.items_per_page:
+        next_cursor = encode_cursor(like_users[-1].liked_at, like_users[-1].like_id)
+        next_params = urlencode({**filter_params, "cursor": next_cursor})
+        links.append(Link(href=f"/likes?{next_params}", rel="next", method="GET"))
+
     response = GetLikeUsersResponse(
-        users=[
-            LikeUserResponse(
-                id=user.id,  # type: ignore
-                nickname=user.nickname,
-                role=user.role,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            )
-            for user in users
-        ]
+        users=[to_like_user_response(like_user) for like_user in like_users],
+        links=links,
     )
 
     return response
 
 
+def to_like_user_response(like_user: Row) -> LikeUserResponse:
+    return LikeUserResponse(
+        id=like_user.id,
+        nickname=like_user.nickname,
+        role=like_user.role,
+        created_at=like_user.created_at,
+        updated_at=like_user.updated_at,
+    )
+
+
 @router.delete("/{like_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_like(
     like_id: int,
     like_service: LikeServiceBase = Depends(LikeService),
+    redis: Redis = Depends(get_redis),
     current_user: SessionContent = Depends(get_current_user),
 ) -> None:
     user_id = current_user.id
@@ -119,3 +162,8 @@ async def delete_like(
         )
 
     await like_service.delete_like(like)
+
+    try:
+        await invalidate_namespace(redis, "posts")
+    except:
+        pass
@@ -1,11 +1,22 @@
-import json
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from src.auth import get_current_user
+from src.auth import get_current_user, get_optional_user
+from src.cache import get_or_set, invalidate_key, invalidate_namespace
+from src.config import config
 from src.database import cache_servers, consistent_hash, get_redis
 from src.domains.user import Role
+from src.pagination import decode_cursor, encode_cursor
 from src.schemas.auth import SessionContent
 from src.schemas.common import Link
 from src.schemas.post import (
@@ -19,7 +30,9 @@ from src.schemas.post import (
     PostsResponse,
     PostsResponseBody,
 )
+from src.servicies.like import LikeService, LikeServiceBase
 from src.servicies.post import PostService
+from src.view_counter import count_unique_viewers, post_view_buffer
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -54,7 +67,7 @@ async def create_post(
     )
 
     try:
-        await redis.delete("posts:*")
+        await invalidate_namespace(redis, "posts")
     except:
         pass
 
@@ -64,66 +77,104 @@ async def create_post(
 @router.get("/", response_model=PostsResponse, status_code=status.HTTP_200_OK)
 async def get_posts(
     page: int = Query(1),
+    cursor: str | None = Query(None),
     service: PostService = Depends(PostService),
+    like_service: LikeServiceBase = Depends(LikeService),
     redis: Redis = Depends(get_redis),
 ) -> PostsResponse:
-    cache_key = f"posts:page:{page}"
-    try:
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            return PostsResponse(**json.loads(cached_data))
-    except:
-        pass
+    decoded_cursor = decode_cursor(cursor) if cursor else None
+    cache_key = f"cursor:{cursor}" if cursor else f"page:{page}"
 
-    posts = await service.get_posts(page)
-
-    response = PostsResponse(
-        posts=[
-            PostsResponseBody(
-                id=post.id,  # type: ignore
-                author=post.user.nickname,
-                title=post.title,
-                created_at=post.created_at,
-                updated_at=post.updated_at,
-                comment=CommentPartial(count=len(post.comments)),
-                like=LikePartial(count=len(post.likes)),
-                view_count=post.post_view.count,
-                links=[
-                    Link(href=f"/posts/{post.id}", rel="self", method="GET"),
-                    Link(
-                        href=f"/posts/{post.id}", rel="update_partial", method="PATCH"
-                    ),
-                    Link(href=f"/posts/{post.id}", rel="update_whole", method="PUT"),
-                    Link(href=f"/posts/{post.id}", rel="delete", method="DELETE"),
-                    Link(
-                        href=f"/likes/?post_id={post.id}",
-                        rel="liked_users",
-                        method="GET",
-                    ),
-                ],
-            )
-            for post in posts
-        ],
-        links=[
+    async def load_posts() -> dict:
+        # 캐시는 TTL 동안 모두에게 응답되므로 replica 지연이 남지 않도록 primary에서 조회
+        posts = await service.get_posts_with_counts(
+            page=page, cursor=decoded_cursor, primary=True
+        )
+
+        links = [
             Link(href=f"/posts", rel="self", method="GET"),
             Link(href="/posts", rel="create", method="POST"),
-        ],
+        ]
+        # 마지막 포스트 기준 다음 페이지 커서
+        if len(posts) == service.items_per_page:
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+            links.append(
+                Link(href=f"/posts?cursor={next_cursor}", rel="next", method="GET")
+            )
+
+        response = PostsResponse(
+            posts=[
+                PostsResponseBody(
+                    id=post.id,  # type: ignore
+                    author=post.author,
+                    title=post.title,
+                    created_at=post.created_at,
+                    updated_at=post.updated_at,
+                    comment=CommentPartial(count=post.comment_count),
+                    like=LikePartial(count=post.like_count),
+                    view_count=post.view_count,
+                    links=[
+                        Link(href=f"/posts/{post.id}", rel="self", method="GET"),
+                        Link(
+                            href=f"/posts/{post.id}",
+                            rel="update_partial",
+                            method="PATCH",
+                        ),
+                        Link(
+                            href=f"/posts/{post.id}", rel="update_whole", method="PUT"
+                        ),
+                        Link(href=f"/posts/{post.id}", rel="delete", method="DELETE"),
+                        Link(
+                            href=f"/likes/?post_id={post.id}",
+                            rel="liked_users",
+                            method="GET",
+                        ),
+                    ],
+                )
+                for post in posts
+            ],
+            links=links,
+        )
+        return response.model_dump(mode="json")
+
+    # 캐시 만료시 동시 요청이 DB로 몰리지 않도록 get_or_set으로 조회
+    posts_data = await get_or_set(
+        redis=redis, key=cache_key, loader=load_posts, namespace="posts"
     )
+    posts_response = PostsResponse(**posts_data)
+
+    # 순 방문자 수는 캐시하지 않고 요청마다 HyperLogLog에서 읽는다
     try:
-        await redis.setex(
-            name=cache_key, time=3600, value=json.dumps(response.model_dump())
+        unique_view_counts = await count_unique_viewers(
+            [post.id for post in posts_response.posts]
+        )
+    except RedisError:
+        unique_view_counts = {}
+    for post_body in posts_response.posts:
+        post_body.unique_view_count, post_body.today_unique_view_count = (
+            unique_view_counts.get(post_body.id, (0, 0))
         )
-    except:
-        pass
 
-    return response
+    # 좋아요 수도 캐시 밖에서 Redis 집합으로 읽는다. 읽지 못한 포스트는 캐시된 like_count 사용
+    if config.LIKE_CACHE_ENABLED:
+        like_counts = await like_service.get_like_counts(
+            [post_body.id for post_body in posts_response.posts]
+        )
+        for post_body in posts_response.posts:
+            post_body.like.count = like_counts.get(post_body.id, post_body.like.count)
+
+    return posts_response
 
 
 @router.get("/{post_id}", response_model=PostResponse, status_code=status.HTTP_200_OK)
 async def get_post(
+    request: Request,
     response: Response,
     post_id: int,
     service: PostService = Depends(PostService),
+    like_service: LikeServiceBase = Depends(LikeService),
+    session_id: str | None = Cookie(None),
+    current_user: SessionContent | None = Depends(get_optional_user),
 ) -> PostResponse:
     cache_key = f"post:post_id:{post_id}"
 
@@ -133,59 +184,66 @@ async def get_post(
     # 캐시 미스일때도 캐시정보를 반환?
     response.headers["X-CacheServer-Index"] = str(server_index)
     response.headers["X-CacheServer-Count"] = str(len(cache_servers))
-    try:
-        # cache_key를 key로 입력하느라 Depends()에서 직접 호출로 변경되었음.
-        # Depends()를 유지하는 방법은 없을까?
-        redis = await get_redis(cache_key)
-
-        # 선택된 캐시 서버에 연결
-        cached_data = await redis.get(cache_key)
-
-        if cached_data:
-            return PostResponse(**json.loads(cached_data))
-    except:
-        pass
 
-    try:
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            return PostResponse(**json.loads(cached_data))
-    except:
-        pass
+    # cache_key를 key로 입력하느라 Depends()에서 직접 호출로 변경되었음.
+    # Depends()를 유지하는 방법은 없을까?
+    redis = await get_redis(cache_key)
+
+    async def load_post() -> dict | None:
+        # 캐시는 TTL 동안 모두에게 응답되므로 replica 지연이 남지 않도록 primary에서 조회
+        post = await service.get_post(post_id, primary=True)
+        if not post:
+            return None
+
+        post_response = PostResponse(
+            id=post.id,  # type: ignore
+            author=post.user.nickname,
+            title=post.title,
+            content=post.content,
+            created_at=post.created_at,
+            updated_at=post.updated_at,
+            links=[
+                Link(href=f"/posts/{post.id}", rel="self", method="GET"),
+                Link(href=f"/posts/{post.id}", rel="update_partial", method="PATCH"),
+                Link(href=f"/posts/{post.id}", rel="update_whole", method="PUT"),
+                Link(href=f"/posts/{post.id}", rel="delete", method="DELETE"),
+                Link(
+                    href=f"/likes/?post_id={post.id}", rel="liked_users", method="GET"
+                ),
+                Link(href="/posts", rel="collection", method="GET"),
+                Link(href="/posts", rel="create", method="POST"),
+                # like? 좋아요 기능을 넣었을 때 게시물에서는 보통 동작해야 할 것 같다
+            ],
+        )
+        return post_response.model_dump(mode="json")
 
-    post = await service.get_post(post_id)
-    if not post:
+    # 캐시 만료시 동시 요청이 DB로 몰리지 않도록 get_or_set으로 조회
+    post_data = await get_or_set(redis=redis, key=cache_key, loader=load_post)
+    if not post_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
         )
 
-    post_response = PostResponse(
-        id=post.id,  # type: ignore
-        author=post.user.nickname,
-        title=post.title,
-        content=post.content,
-        created_at=post.created_at,
-        updated_at=post.updated_at,
-        links=[
-            Link(href=f"/posts/{post.id}", rel="self", method="GET"),
-            Link(href=f"/posts/{post.id}", rel="update_partial", method="PATCH"),
-            Link(href=f"/posts/{post.id}", rel="update_whole", method="PUT"),
-            Link(href=f"/posts/{post.id}", rel="delete", method="DELETE"),
-            Link(href=f"/likes/?post_id={post.id}", rel="liked_users", method="GET"),
-            Link(href="/posts", rel="collection", method="GET"),
-            Link(href="/posts", rel="create", method="POST"),
-            # like? 좋아요 기능을 넣었을 때 게시물에서는 보통 동작해야 할 것 같다
-        ],
-    )
-    await service.increase_post_view(post_id=post.id)  # type: ignore
+    # 조회수/순 방문자는 메모리에 누적 후 스케줄러가 반영. 방문자는 세션 또는 IP로 구분
+    viewer = session_id or (request.client.host if request.client else "")
+    post_view_buffer.add(post_id, viewer)
 
+    post_response = PostResponse(**post_data)
+    # 순 방문자 수는 캐시하지 않고 요청마다 HyperLogLog에서 읽는다
     try:
-        await redis.setex(
-            name=cache_key, time=3600, value=json.dumps(post_response.model_dump())
-        )
-    except:
+        post_response.unique_view_count, post_response.today_unique_view_count = (
+            await count_unique_viewers([post_id])
+        )[post_id]
+    except RedisError:
         pass
 
+    # 좋아요 여부는 유저마다 다르므로 캐시하지 않는다
+    if current_user:
+        like = await like_service.get_like_by_user_and_post(
+            user_id=current_user.id, post_id=post_id
+        )
+        post_response.like_id = like.id if like else None
+
     return post_response
 
 
@@ -200,7 +258,7 @@ async def edit_post(
     user_id = current_user.id
     user_role = current_user.role
 
-    post = await service.get_post(post_id)
+    post = await service.get_post(post_id, primary=True)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
@@ -215,8 +273,11 @@ async def edit_post(
 
     # 204 상태코드에선 어떻게? 보통 header의 Link에 HATEOAS 구성하면 문제없을 것 같은데 response 객체로 구성했을 때는?
     try:
-        await redis.delete(f"post:post_id:{post_id}")
-        await redis.delete("posts:*")
+        await invalidate_namespace(redis, "posts")
+        # 상세 캐시는 안정해시로 선택된 캐시 서버에 저장되어 있음
+        post_cache_key = f"post:post_id:{post_id}"
+        post_redis = await get_redis(post_cache_key)
+        await invalidate_key(post_redis, post_cache_key)
     except:
         pass
 
@@ -232,7 +293,7 @@ async def edit_post_whole(
     user_id = current_user.id
     user_role = current_user.role
 
-    post = await service.get_post(post_id)
+    post = await service.get_post(post_id, primary=True)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 포스트입니다"
@@ -247,8 +308,11 @@ async def edit_post_whole(
     # 204 상태코드
 
     try:
-        await redis.delete(f"post:post_id:{post_id}")
-        await redis.delete("posts:*")
+        await invalidate_namespace(redis, "posts")
+        # 상세 캐시는 안정해시로 선택된 캐시 서버에 저장되어 있음
+        post_cache_key = f"post:post_id:{post_id}"
+        post_redis = await get_redis(post_cache_key)
+        await invalidate_key(post_redis, post_cache_key)
     except:
         pass
 
@@ -263,7 +327,7 @@ async def delete_post(
     user_id = current_user.id
     user_role = current_user.role
 
-    post = await service.get_post(post_id)
+    post = await service.get_post(post_id, primary=True)
 
     if not post:
         raise HTTPException(
@@ -280,7 +344,10 @@ async def delete_post(
     # 204 상태코드
 
     try:
-        await redis.delete(f"post:post_id:{post_id}")
-        await redis.delete("posts:*")
+        await invalidate_namespace(redis, "posts")
+        # 상세 캐시는 안정해시로 선택된 캐시 서버에 저장되어 있음
+        post_cache_key = f"post:post_id:{post_id}"
+        post_redis = await get_redis(post_cache_key)
+        await invalidate_key(post_redis, post_cache_key)
     except:
         pass
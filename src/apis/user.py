@@ -1,9 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
-from ulid import ULID
+from sqlalchemy.exc import IntegrityError
 
-from src.auth import get_current_user, verify_password
+from src.auth import get_current_user, verify_password_async
 from src.config import config
 from src.domains.image import Image, SaveType
 from src.schemas.auth import SessionContent
@@ -14,7 +14,7 @@ from src.schemas.user import (
     SignUpResponse,
     UserResponse,
 )
-from src.servicies.auth import AuthService
+from src.servicies.session_backend import SessionBackendBase, get_session_backend
 from src.servicies.user import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -32,9 +32,15 @@ async def signup(
             status_code=status.HTTP_409_CONFLICT, detail="이미 가입한 유저입니다"
         )
 
-    new_user = await service.signup_account(
-        nickname=request.nickname, password=request.password, img_id=request.img_id
-    )
+    try:
+        new_user = await service.signup_account(
+            nickname=request.nickname, password=request.password, img_id=request.img_id
+        )
+    except IntegrityError:
+        # 동시에 같은 닉네임으로 가입한 경우 unique 인덱스에서 거절
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="이미 가입한 유저입니다"
+        )
 
     if not new_user.id:
         raise HTTPException(
@@ -50,7 +56,7 @@ async def login(
     response: Response,
     request: LoginRequest,
     user_service: UserService = Depends(UserService),
-    auth_service: AuthService = Depends(AuthService),
+    session_backend: SessionBackendBase = Depends(get_session_backend),
     session_id: str | None = Cookie(None),
 ) -> LoginResponse:
     user = await user_service.get_user_by_nickname(request.nickname)
@@ -59,24 +65,18 @@ async def login(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="존재하지 않는 유저입니다"
         )
-    if not verify_password(
+    if not await verify_password_async(
         plain_password=request.password, hashed_password=user.password
     ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="잘못된 비밀번호입니다"
         )
 
-    session = await auth_service.find_session(session_id)
-    new_session_id = (
-        session_id
-        if (session and session_id)
-        else str(ULID.from_datetime(datetime.now()))
-    )
     session_value = SessionContent(id=user.id, nickname=user.nickname, role=user.role)  # type: ignore
-    await auth_service.insert_session(
-        session_id=new_session_id,
+    new_session_id = await session_backend.create_session(
         content=session_value,
         expires_delta=timedelta(days=1),
+        session_id=session_id,
     )
     response.set_cookie(key="session_id", value=new_session_id, httponly=True)
 
@@ -85,22 +85,22 @@ async def login(
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
+    response: Response,
     session_id: str | None = Cookie(None),
-    auth_service: AuthService = Depends(AuthService),
+    session_backend: SessionBackendBase = Depends(get_session_backend),
 ) -> None:
     if not session_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="세션 아이디가 없습니다."
         )
 
-    session = await auth_service.find_session(session_id)
+    deleted = await session_backend.delete_session(session_id)
 
-    if session:
-        await auth_service.delete_session(session)
-    else:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="존재하지 않는 세션입니다"
         )
+    response.delete_cookie(key="session_id", httponly=True)
 
 
 @router.get("/profile", status_code=status.HTTP_200_OK)
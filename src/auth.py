@@ -1,11 +1,14 @@
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Any, Callable
 
 from fastapi import Cookie, Depends, HTTPException, status
 from passlib.context import CryptContext
 
+from src.config import config
 from src.schemas.auth import SessionContent
-from src.servicies.auth import AuthService
+from src.servicies.session_backend import SessionBackendBase, get_session_backend
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -20,8 +23,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return valid
 
 
+# bcrypt 해시/검증 전용 스레드 풀. bcrypt는 계산 중 GIL을 풀어서 이벤트 루프를 막지 않는다
+password_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password"
+)
+
+
+# 비밀번호 작업 대기열 지표
+class PasswordHashMetrics:
+    def __init__(self) -> None:
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "workers": config.PASSWORD_HASH_WORKERS,
+            "pending": self.pending,
+            "queued": max(0, self.pending - config.PASSWORD_HASH_WORKERS),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hash_metrics = PasswordHashMetrics()
+
+
+async def _run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    # 대기열이 가득 차면 더 쌓지 않고 거절
+    if password_hash_metrics.pending >= config.PASSWORD_HASH_MAX_PENDING:
+        password_hash_metrics.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요",
+        )
+
+    password_hash_metrics.pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        password_hash_metrics.pending -= 1
+        password_hash_metrics.completed += 1
+
+
+async def hash_password_async(plain_password: str) -> str:
+    hashed_password: str = await _run_password_task(hash_password, plain_password)
+    return hashed_password
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    valid: bool = await _run_password_task(
+        verify_password, plain_password, hashed_password
+    )
+    return valid
+
+
 async def get_current_user(
-    session_id: str | None = Cookie(None), service: AuthService = Depends(AuthService)
+    session_id: str | None = Cookie(None),
+    session_backend: SessionBackendBase = Depends(get_session_backend),
 ) -> SessionContent:
     if not session_id:
         raise HTTPException(
@@ -29,22 +89,14 @@ async def get_current_user(
             detail="세션 아이디가 입력되지 않았습니다. 다시 로그인 해 주세요",
         )
 
-    session_result = await service.find_session(session_id)
+    session_content = await session_backend.get_session_content(session_id)
 
-    if not session_result:
+    if not session_content:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="존재하지 않는 세션입니다. 다시 로그인 해 주세요",
         )
 
-    session_content_json = json.loads(session_result.session_data)
-    session_content = SessionContent(
-        id=session_content_json["id"],
-        nickname=session_content_json["nickname"],
-        role=session_content_json["role"],
-        expire=session_content_json["expire"],
-    )
-
     is_expired = datetime.now(tz=timezone.utc) >= session_content.expire  # type: ignore
     if is_expired:
         raise HTTPException(
@@ -52,3 +104,21 @@ async def get_current_user(
             detail="만료된 세션입니다. 다시 로그인 해주세요",
         )
     return session_content
+
+
+# 로그인하지 않아도 되는 조회용. 세션이 없거나 만료되었으면 None
+async def get_optional_user(
+    session_id: str | None = Cookie(None),
+    session_backend: SessionBackendBase = Depends(get_session_backend),
+) -> SessionContent | None:
+    if not session_id:
+        return None
+
+    session_content = await session_backend.get_session_content(session_id)
+    if not session_content:
+        return None
+
+    is_expired = datetime.now(tz=timezone.utc) >= session_content.expire  # type: ignore
+    if is_expired:
+        return None
+    return session_content
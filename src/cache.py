@@ -0,0 +1,211 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
+
+from src.config import config
+from src.pubsub import publish, subscribe
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidation"
+
+
+# 워커별 인메모리 LRU + TTL 캐시(L1). Redis(L2) 앞에서 네트워크 I/O 없이 응답
+class LocalCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        expire_at, value = entry
+        if time.monotonic() >= expire_at:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def delete_namespace(self, namespace: str) -> None:
+        prefix = f"{namespace}:"
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+
+
+local_cache = LocalCache(maxsize=config.LOCAL_CACHE_SIZE, ttl=config.LOCAL_CACHE_TTL)
+
+# 워커 내 같은 키에 대해 진행 중인 조회. 동시 요청은 하나의 조회 결과를 공유(single-flight)
+_inflight: dict[str, asyncio.Task] = {}
+
+
+# 다른 워커에서 발행한 무효화 메시지로 L1 캐시 제거
+def _on_invalidation(message: str) -> None:
+    invalidation = json.loads(message)
+    if "namespace" in invalidation:
+        local_cache.delete_namespace(invalidation["namespace"])
+    if "key" in invalidation:
+        local_cache.delete(invalidation["key"])
+
+
+subscribe(CACHE_INVALIDATION_CHANNEL, _on_invalidation)
+
+
+# 네임스페이스 버전(세대) 키. 쓰기 시 버전을 올려서 해당 네임스페이스 캐시 전체를 무효화
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+async def get_versioned_key(redis: Redis, namespace: str, key: str) -> str:
+    version = await redis.get(_version_key(namespace))
+    return f"{namespace}:v{int(version) if version else 0}:{key}"
+
+
+async def invalidate_namespace(redis: Redis, namespace: str) -> None:
+    # 이전 버전 키는 더 이상 조회되지 않고 TTL로 만료된다. SCAN/KEYS 불필요
+    await redis.incr(_version_key(namespace))
+    local_cache.delete_namespace(namespace)
+    await publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"namespace": namespace}))
+
+
+async def invalidate_key(redis: Redis, key: str) -> None:
+    await redis.delete(key)
+    local_cache.delete(key)
+    await publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"key": key}))
+
+
+# cache-aside 조회. loader는 JSON 직렬화 가능한 값(없으면 None)을 반환해야 한다.
+# - L1: 워커 메모리에 있으면 Redis 조회 없이 반환
+# - 워커 내: 같은 키 동시 요청은 한 번만 조회
+# - 워커 간: Redis 락을 잡은 요청만 loader 실행, 나머지는 이전 값 반환 또는 대기
+# - 만료 전: XFetch 확률적 조기 갱신으로 만료 시점에 요청이 몰리지 않게 함
+async def get_or_set(
+    redis: Redis,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int = 3600,
+    namespace: str | None = None,
+    beta: float = 1.0,
+) -> Any:
+    local_key = f"{namespace}:{key}" if namespace else key
+    value = local_cache.get(local_key)
+    if value is not None:
+        return value
+
+    task = _inflight.get(local_key)
+    if not task:
+        task = asyncio.create_task(
+            _get_or_load(redis, key, loader, ttl, namespace, beta)
+        )
+        _inflight[local_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(local_key, None))
+
+    # 먼저 요청한 쪽이 취소되어도 대기 중인 요청에는 결과가 전달되도록 shield
+    value = await asyncio.shield(task)
+    if value is not None:
+        local_cache.set(local_key, value)
+
+    return value
+
+
+async def _get_or_load(
+    redis: Redis,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int,
+    namespace: str | None,
+    beta: float,
+) -> Any:
+    try:
+        if namespace:
+            key = await get_versioned_key(redis, namespace, key)
+        cached = _decode(await redis.get(key))
+    except RedisError:
+        # 캐시 서버 장애시 DB 조회로 대체
+        return await loader()
+
+    if cached and not _should_refresh_early(cached, beta):
+        return cached["value"]
+
+    lock = redis.lock(f"{key}:lock", timeout=10)
+    try:
+        locked = await lock.acquire(blocking=False)
+    except RedisError:
+        locked = False
+
+    if not locked:
+        # 다른 워커가 갱신 중. 이전 값이 있으면 그대로 반환(stale-while-revalidate)
+        if cached:
+            return cached["value"]
+        filled = await _wait_for_fill(redis, key)
+        if filled:
+            return filled["value"]
+
+    try:
+        started_at = time.monotonic()
+        value = await loader()
+        delta = time.monotonic() - started_at
+
+        if value is not None:
+            envelope = {"value": value, "delta": delta, "expiry": time.time() + ttl}
+            try:
+                await redis.setex(name=key, time=ttl, value=json.dumps(envelope))
+            except RedisError:
+                pass
+        return value
+    finally:
+        if locked:
+            try:
+                await lock.release()
+            except (LockError, RedisError):
+                pass
+
+
+def _decode(cached_data: str | bytes | None) -> dict | None:
+    if not cached_data:
+        return None
+    try:
+        cached = json.loads(cached_data)
+    except ValueError:
+        return None
+    if not isinstance(cached, dict) or "value" not in cached:
+        return None
+    return cached
+
+
+# XFetch: 만료가 가까울수록, 재계산이 오래 걸릴수록 조기 갱신 확률이 높아진다
+def _should_refresh_early(cached: dict, beta: float) -> bool:
+    delta = float(cached.get("delta", 0))
+    expiry = float(cached.get("expiry", 0))
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+async def _wait_for_fill(
+    redis: Redis, key: str, retries: int = 10, interval: float = 0.05
+) -> dict | None:
+    for _ in range(retries):
+        await asyncio.sleep(interval)
+        try:
+            cached = _decode(await redis.get(key))
+        except RedisError:
+            return None
+        if cached:
+            return cached
+    return None
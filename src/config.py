@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Literal
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -11,9 +13,79 @@ class Config(BaseSettings):
     GCP_STORAGE_URL: str = Field(default="https://storage.googleapis.com")
     GCP_BUCKET_NAME: str = Field(default="fastapi-post-storage")
 
-    # bucket rate limit
+    # 조회 전용 replica 목록(JSON 배열). 쓰기 후 primary에서 조회할 시간(초), 0이면 사용 안 함
+    DATABASE_REPLICA_URLS: list[str] = Field(default=[])
+    READ_YOUR_WRITES_SECONDS: int = 0
+
+    # DB 커넥션 풀
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 0
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 60 * 30
+    # 앱 시작시 스키마 생성/변경 실행 여부. 여러 워커로 실행하면 끄고 python -m src.migrate를 먼저 실행
+    DATABASE_MIGRATE_ON_STARTUP: bool = True
+
+    # 워커별 인메모리 캐시(L1). 0이면 비활성화
+    LOCAL_CACHE_SIZE: int = 1024
+    LOCAL_CACHE_TTL: float = 10.0
+
+    # 조회수 DB 반영 주기(초)
+    POST_VIEW_FLUSH_SECONDS: int = 10
+
+    # 좋아요 여부/좋아요 수를 Redis 집합으로 조회. 집합 보관 기간(초)
+    LIKE_CACHE_ENABLED: bool = False
+    LIKE_CACHE_TTL: int = 60 * 60 * 24
+
+    # 비밀번호 해시/검증 스레드 수와 최대 대기 작업 수
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # 만료 세션 삭제 주기(초)와 한 번에 삭제할 row 수
+    SESSION_PURGE_SECONDS: int = 60 * 60
+    SESSION_PURGE_BATCH_SIZE: int = 1000
+
+    # 세션 저장 방식. database: loginsession 테이블, signed: 서명된 토큰(무상태)
+    SESSION_BACKEND: Literal["database", "signed"] = "database"
+    SESSION_SECRET_KEY: str = Field(default="")
+    # 서명된 토큰 로그아웃시 Redis 폐기 목록 사용 여부
+    SESSION_REVOCATION_ENABLED: bool = True
+    # Redis 장애로 폐기 목록을 확인할 수 없을 때 True면 서명/만료만 확인하고 허용(fail-open),
+    # False면 모든 서명 토큰을 거부(fail-closed). 기본값은 Redis 장애가 전체 인증 장애로 번지지 않도록 fail-open
+    SESSION_REVOCATION_FAIL_OPEN: bool = True
+
+    # 처리율 제한 알고리즘
+    RATE_LIMIT_ALGORITHM: Literal["token_bucket", "gcra", "sliding_window"] = (
+        "token_bucket"
+    )
+
+    # bucket rate limit. 조회(GET) 요청 기본 정책
     REQUESTS_PER_MINUTE: int = 60
     BUCKET_SIZE: float = 10.0
+    # 쓰기 요청(POST/PUT/PATCH/DELETE) 정책
+    WRITE_REQUESTS_PER_MINUTE: int = 30
+    WRITE_BUCKET_SIZE: float = 5.0
+    # POST /users/login 정책
+    LOGIN_REQUESTS_PER_MINUTE: int = 10
+    LOGIN_BUCKET_SIZE: float = 5.0
+    # POST /images/profile 정책
+    UPLOAD_REQUESTS_PER_MINUTE: int = 6
+    UPLOAD_BUCKET_SIZE: float = 2.0
+    # 워커가 Redis에서 한 번에 임대하는 최대 토큰 수와 임대 유효 시간(초). 1이면 요청마다 Redis 조회.
+    # 정책별 임대 크기는 버킷 크기의 1/10을 넘지 않는다. 쓰지 않은 토큰은 만료시 버려지므로 유효 시간은 짧게 둔다
+    RATE_LIMIT_LEASE_SIZE: int = 5
+    RATE_LIMIT_LEASE_TTL: float = 1.0
+    # 워커별로 임대 토큰을 보관할 최대 클라이언트 수
+    RATE_LIMIT_LOCAL_BUCKETS: int = 10000
+
+    # 캐시 서버 consistent hash 가상 노드 수
+    VIRTUAL_NODES: int = 100
+
+    # 서명 키 없이 signed 세션을 쓰면 요청마다 실패하므로 시작시 확인
+    @model_validator(mode="after")
+    def check_session_secret_key(self) -> "Config":
+        if self.SESSION_BACKEND == "signed" and not self.SESSION_SECRET_KEY:
+            raise ValueError("SESSION_BACKEND=signed는 SESSION_SECRET_KEY가 필요합니다")
+        return self
 
 
 config = Config()
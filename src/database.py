@@ -1,42 +1,142 @@
+import itertools
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
-from redis import Redis
+from fastapi import Depends, FastAPI, Request, Response
 from redis import asyncio as aioredis
-from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import Connection, inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel, text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import config
 from src.consistent_hash import ConsistentHash
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = config.DATABASE_URL
 REDIS_URL = config.REDIS_URL
-engine = AsyncEngine(create_engine(url=DATABASE_URL, pool_size=20, max_overflow=0))
+
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url=url,
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+    )
+
+
+def create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+engine = create_engine(DATABASE_URL)
+# 세션 팩토리는 앱 전체에서 하나만 사용
+AsyncSessionLocal = create_sessionmaker(engine)
+
+# 조회 전용 replica. 없으면 조회도 primary에서 처리
+replica_engines = [create_engine(url) for url in config.DATABASE_REPLICA_URLS]
+ReplicaSessionLocals = [create_sessionmaker(bind) for bind in replica_engines]
+_replica_counter = itertools.count()
+
+# 쓰기 요청 후 READ_YOUR_WRITES_SECONDS 동안 조회를 primary로 보내는 쿠키
+READ_YOUR_WRITES_COOKIE = "read_primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 redis = aioredis.from_url(url=REDIS_URL, encoding="utf-8", decode_responses=True)
 
 
-@asynccontextmanager
-async def db_init(app: FastAPI):
+# create_all은 기존 테이블을 변경하지 않으므로 모델에 새로 추가된 nullable 컬럼을 추가
+def add_missing_columns(conn: Connection) -> None:
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in SQLModel.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns or not column.nullable:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            try:
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}"
+                    )
+                )
+                logger.info("컬럼 추가: %s.%s", table.name, column.name)
+            except DBAPIError as e:
+                # 여러 워커가 동시에 시작하면 다른 워커가 먼저 추가한 컬럼과 중복될 수 있다
+                logger.warning(
+                    "컬럼 추가 실패: %s.%s (%s)", table.name, column.name, e.orig
+                )
+
+
+# create_all은 기존 테이블에 인덱스를 추가하지 않으므로 모델에 선언된 인덱스 중 없는 것을 생성
+def create_missing_indexes(conn: Connection) -> None:
+    inspector = inspect(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in indexes:
+                continue
+            try:
+                index.create(conn)
+                logger.info("인덱스 생성: %s", index.name)
+            except DBAPIError as e:
+                # unique 인덱스는 중복 데이터가 있으면 실패. 데이터 정리 후 재시작하면 생성된다
+                logger.warning("인덱스 생성 실패: %s (%s)", index.name, e.orig)
+
+
+# 테이블/컬럼/인덱스 생성. 배포시 python -m src.migrate로 한 번 실행
+async def migrate() -> None:
     async with engine.begin() as conn:
         # await conn.run_sync(SQLModel.metadata.drop_all)
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(create_missing_indexes)
+
+
+# 여러 워커로 실행할 때는 DATABASE_MIGRATE_ON_STARTUP=false로 두고 시작 전에 migrate를 실행한다
+@asynccontextmanager
+async def db_init(app: FastAPI):
+    if config.DATABASE_MIGRATE_ON_STARTUP:
+        await migrate()
     yield
 
 
-async def get_session() -> AsyncSession:  # type: ignore
-    AsyncSessionLocal = sessionmaker(  # type: ignore
-        autocommit=False,
-        autoflush=False,
-        expire_on_commit=False,
-        bind=engine,
-        class_=AsyncSession,
-    )
+# 한 요청 안에서 여러 서비스가 Depends(get_session)를 써도 FastAPI 의존성 캐시로 같은 세션을 공유
+async def get_session(request: Request, response: Response) -> AsyncSession:  # type: ignore
+    if config.READ_YOUR_WRITES_SECONDS > 0 and request.method not in SAFE_METHODS:
+        response.set_cookie(
+            key=READ_YOUR_WRITES_COOKIE,
+            value="1",
+            max_age=config.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+        )
     async with AsyncSessionLocal() as session:
         yield session
 
 
+# 조회 전용 세션. replica를 돌아가며 사용하고, 직전에 쓰기를 한 클라이언트는 primary에서 조회
+async def get_read_session(  # type: ignore
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> AsyncSession:
+    if not ReplicaSessionLocals or request.cookies.get(READ_YOUR_WRITES_COOKIE):
+        yield session
+        return
+
+    index = next(_replica_counter) % len(ReplicaSessionLocals)
+    async with ReplicaSessionLocals[index]() as read_session:
+        yield read_session
+
+
 class RedisConnectionPool:
     def __init__(self, servers):
         self.connections = {}
@@ -52,10 +152,10 @@ cache_servers = ["localhost:6379", "localhost:6380", "localhost:6381"]
 
 # 애플리케이션 시작 시 초기화
 redis_pool = RedisConnectionPool(cache_servers)
-consistent_hash = ConsistentHash(cache_servers)
+consistent_hash = ConsistentHash(cache_servers, virtual_nodes=config.VIRTUAL_NODES)
 
 
-async def get_redis(key: str | None = None) -> Redis:
+async def get_redis(key: str | None = None) -> aioredis.Redis:
     if not key:
         key = ""
     server, _ = consistent_hash.get_node(key)
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, func
 
 from src.domains.post import Post
@@ -7,6 +8,13 @@ from src.domains.user import User
 
 
 class Comment(SQLModel, table=True):  # type: ignore
+    # keyset 페이지네이션 정렬 순서. 포스트별/작성자별/전체 조회
+    __table_args__ = (
+        Index("ix_comment_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_comment_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_comment_created_at_id", "created_at", "id"),
+    )
+
     id: int | None = Field(primary_key=True)
     content: str
     created_at: datetime = Field(default=func.now())
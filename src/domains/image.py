@@ -1,6 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, func
 
 from src.domains.user import User
@@ -21,6 +22,12 @@ class UseType(str, Enum):
 
 
 class Image(SQLModel, table=True):  # type: ignore
+    # 유저 프로필 이미지 조회, 오래된 PENDING 이미지 정리
+    __table_args__ = (
+        Index("ix_image_user_id_state_use_type", "user_id", "state", "use_type"),
+        Index("ix_image_state_created_at", "state", "created_at"),
+    )
+
     id: int | None = Field(primary_key=True)
     name: str
     save_type: SaveType = Field(default=SaveType.LOCAL)
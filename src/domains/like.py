@@ -1,9 +1,18 @@
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, func
 
 
 class Like(SQLModel, table=True):  # type: ignore
+    # 유저당 포스트 좋아요 한 번. 포스트별 좋아요 유저 조회, 좋아요 순서 커서 페이지네이션(포스트별/전체)
+    __table_args__ = (
+        Index("ux_like_user_id_post_id", "user_id", "post_id", unique=True),
+        Index("ix_like_post_id_user_id", "post_id", "user_id"),
+        Index("ix_like_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_like_created_at_id", "created_at", "id"),
+    )
+
     id: int | None = Field(primary_key=True)
     created_at: datetime = Field(default=func.now())
 
@@ -7,3 +7,5 @@ class LoginSession(SQLModel, table=True):  # type: ignore
     id: str | None = Field(primary_key=True)
     session_data: str
     created_at: datetime = Field(default=func.now())
+    # 만료 세션 일괄 삭제용
+    expires_at: datetime | None = Field(default=None, index=True)
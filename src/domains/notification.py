@@ -1,6 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, func
 
 
@@ -10,6 +11,13 @@ class Role(Enum):
 
 
 class Notification(SQLModel, table=True):  # type: ignore
+    # 유저별 알림 조회
+    __table_args__ = (
+        Index(
+            "ix_notification_target_user_id_created_at", "target_user_id", "created_at"
+        ),
+    )
+
     id: int | None = Field(primary_key=True)
     created_at: datetime = Field(default=func.now())
 
@@ -1,12 +1,17 @@
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel, func
 
+from src.domains.post_stats import PostStats
 from src.domains.post_view import PostView
 from src.domains.user import User
 
 
 class Post(SQLModel, table=True):  # type: ignore
+    # keyset 페이지네이션 정렬 순서
+    __table_args__ = (Index("ix_post_created_at_id", "created_at", "id"),)
+
     id: int | None = Field(primary_key=True)
     title: str
     content: str
@@ -22,6 +27,7 @@ class Post(SQLModel, table=True):  # type: ignore
     likes: list["Like"] = Relationship(back_populates="post")  # type: ignore
 
     post_view: PostView = Relationship(back_populates="post")  # type: ignore
+    post_stats: PostStats = Relationship(back_populates="post")  # type: ignore
 
     notifications: list["Notification"] = Relationship(back_populates="post")  # type: ignore
 
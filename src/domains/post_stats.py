@@ -0,0 +1,10 @@
+from sqlmodel import Field, Relationship, SQLModel
+
+
+class PostStats(SQLModel, table=True):  # type: ignore
+    id: int | None = Field(primary_key=True)
+    like_count: int = Field(default=0)
+    comment_count: int = Field(default=0)
+
+    post_id: int = Field(foreign_key="post.id", unique=True)
+    post: "Post" = Relationship(back_populates="post_stats")  # type: ignore
@@ -5,5 +5,5 @@ class PostView(SQLModel, table=True):  # type: ignore
     id: int | None = Field(primary_key=True)
     count: int = Field(default=0)
 
-    post_id: int = Field(foreign_key="post.id")
+    post_id: int = Field(foreign_key="post.id", unique=True, index=True)
     post: "Post" = Relationship(back_populates="post_view")  # type: ignore
@@ -11,7 +11,7 @@ class Role(str, Enum):
 
 class User(SQLModel, table=True):  # type: ignore
     id: int | None = Field(primary_key=True)
-    nickname: str
+    nickname: str = Field(unique=True, index=True)
     password: str
     role: Role = Field(default=Role.member)
     created_at: datetime = Field(default=func.now())
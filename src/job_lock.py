@@ -0,0 +1,24 @@
+import logging
+import os
+
+from redis.exceptions import RedisError
+
+from src.database import redis
+
+logger = logging.getLogger(__name__)
+
+
+# 스케줄러는 워커마다 실행되므로 DB 전체를 다루는 작업은 주기마다 한 워커만 실행.
+# 락은 주기보다 조금 짧게 유지해서 다음 주기에는 다시 잡을 수 있다. Redis 장애시에는 락 없이 실행
+async def acquire_job_lock(name: str, interval_seconds: int) -> bool:
+    try:
+        acquired = await redis.set(
+            f"scheduler:{name}",
+            os.getpid(),
+            nx=True,
+            ex=max(1, int(interval_seconds * 0.9)),
+        )
+    except RedisError:
+        logger.warning("작업 락을 잡을 수 없어 락 없이 실행: %s", name)
+        return True
+    return bool(acquired)
@@ -0,0 +1,105 @@
+from src.config import config
+from src.database import redis
+
+# 포스트별 좋아요 한 유저 아이디 집합. 빈 집합과 아직 불러오지 않은 집합을 구분하도록 0을 함께 넣어둔다
+LIKERS_LOADED = 0
+
+# 좋아요 추가/취소마다 포스트별 버전을 올린다. 불러온 집합에만 추가. 키가 없을 때 추가하면 일부만 담긴 집합이 생긴다
+ADD_LIKER_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('SADD', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+REMOVE_LIKER_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return redis.call('SREM', KEYS[1], ARGV[1])
+"""
+
+# DB를 읽기 전 버전과 같을 때만 집합을 만든다. 읽는 사이 추가/취소가 있었으면 오래된 목록이므로 버린다
+LOAD_LIKERS_SCRIPT = """
+local version = redis.call('GET', KEYS[2]) or '0'
+if version ~= ARGV[1] or redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+for i = 3, #ARGV do
+    redis.call('SADD', KEYS[1], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+add_liker_script = redis.register_script(ADD_LIKER_SCRIPT)
+remove_liker_script = redis.register_script(REMOVE_LIKER_SCRIPT)
+load_likers_script = redis.register_script(LOAD_LIKERS_SCRIPT)
+
+
+def _likers_key(post_id: int) -> str:
+    return f"post:{post_id}:likers"
+
+
+def _likers_version_key(post_id: int) -> str:
+    return f"post:{post_id}:likers:version"
+
+
+async def add_liker(post_id: int, user_id: int) -> None:
+    await add_liker_script(
+        keys=[_likers_key(post_id), _likers_version_key(post_id)],
+        args=[user_id, config.LIKE_CACHE_TTL],
+    )
+
+
+async def remove_liker(post_id: int, user_id: int) -> None:
+    await remove_liker_script(
+        keys=[_likers_key(post_id), _likers_version_key(post_id)],
+        args=[user_id, config.LIKE_CACHE_TTL],
+    )
+
+
+# 집합을 다시 만들기 전, like 테이블을 읽기 전에 조회. {post_id: 버전}
+async def get_likers_versions(post_ids: list[int]) -> dict[int, str]:
+    versions = await redis.mget([_likers_version_key(post_id) for post_id in post_ids])
+    return {post_id: version or "0" for post_id, version in zip(post_ids, versions)}
+
+
+# like 테이블에서 읽은 유저 아이디로 집합을 만든다. 만료되면 다시 불러와서 누락된 변경을 바로잡는다
+async def load_likers(likers: dict[int, set[int]], versions: dict[int, str]) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for post_id, user_ids in likers.items():
+            await load_likers_script(
+                keys=[_likers_key(post_id), _likers_version_key(post_id)],
+                args=[
+                    versions[post_id],
+                    config.LIKE_CACHE_TTL,
+                    LIKERS_LOADED,
+                    *user_ids,
+                ],
+                client=pipe,
+            )
+        await pipe.execute()
+
+
+# 불러오지 않은 포스트면 None
+async def is_liker(post_id: int, user_id: int) -> bool | None:
+    loaded, liked = await redis.smismember(  # type: ignore
+        _likers_key(post_id), [LIKERS_LOADED, user_id]
+    )
+    if not loaded:
+        return None
+    return bool(liked)
+
+
+# 불러온 포스트만 {post_id: 좋아요 수}
+async def count_likers(post_ids: list[int]) -> dict[int, int]:
+    async with redis.pipeline(transaction=False) as pipe:
+        for post_id in post_ids:
+            pipe.scard(_likers_key(post_id))
+        results = await pipe.execute()
+
+    return {
+        post_id: count - 1 for post_id, count in zip(post_ids, results) if count > 0
+    }
@@ -13,6 +13,8 @@ from src.apis.post import router as post_router
 from src.apis.user import router as user_router
 from src.database import db_init
 from src.middlewares.rate_limit import BucketRateLimitMiddleware
+from src.pubsub import pubsub_listener
+from src.runtime_config import runtime_config_loader
 from src.scheduler import scheduler_shutdown
 
 
@@ -20,7 +22,9 @@ from src.scheduler import scheduler_shutdown
 async def lifespan(app: FastAPI):
     async with db_init(app):
         async with scheduler_shutdown(app):
-            yield
+            async with pubsub_listener(app):
+                async with runtime_config_loader(app):
+                    yield
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,61 +1,335 @@
 import time
+from collections import OrderedDict
 
-from fastapi import Request, Response, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import config
 from src.database import redis
-from src.schemas.common import Bucket
+from src.servicies.session_backend import find_verified_user_id
 
+# 토큰 충전과 소비를 Redis 서버에서 한 번에 처리. 동시 요청에도 토큰이 초과 발급되지 않음
+# KEYS[1]: 버킷 키, ARGV: 초당 충전량, 버킷 크기, 현재 시각, 최대 발급 토큰 수
+# 반환: {발급한 토큰 수(0이면 거부), 남은 토큰, 재시도까지 남은 초}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
 
-# 토큰 버킷 알고리즘
-class BucketRateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if not request.client:
-            return JSONResponse(
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "last_refill")
+local tokens = tonumber(bucket[1])
+local last_refill = tonumber(bucket[2])
+if tokens == nil or last_refill == nil then
+    tokens = capacity
+    last_refill = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - last_refill) * rate)
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "last_refill", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) * 2)
+
+local retry_after = 0
+if tokens < 1 then
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+return {granted, tostring(tokens), retry_after}
+"""
+
+# GCRA. 키마다 TAT(이론적 도착 시각, 밀리초 정수) 하나만 저장한다.
+# 남은 토큰 = 버킷 크기 - (TAT - 현재 시각) * 초당 충전량. 인자와 반환은 토큰 버킷과 같음
+GCRA_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat == nil then
+    tat = now
+else
+    tat = math.max(tat / 1000, now)
+end
+
+local tokens = capacity - (tat - now) * rate
+local granted = math.max(0, math.min(requested, math.floor(tokens)))
+tokens = tokens - granted
+
+if granted > 0 then
+    tat = tat + granted / rate
+    local ttl = math.max(1, math.ceil((tat - now) * 1000))
+    redis.call("SET", KEYS[1], string.format("%d", math.ceil(tat * 1000)), "PX", ttl)
+end
+
+local retry_after = 0
+if tokens < 1 then
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+return {granted, tostring(tokens), retry_after}
+"""
+
+# 슬라이딩 윈도우 카운터. 윈도우(버킷 크기 / 초당 충전량초) 동안 버킷 크기만큼 허용.
+# 이전 윈도우 카운트를 지난 비율만큼 줄여서 현재 윈도우 카운트와 합산한다
+SLIDING_WINDOW_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local window = capacity / rate
+local index = math.floor(now / window)
+local elapsed = now / window - index
+
+local state = redis.call("HMGET", KEYS[1], "window", "current", "previous")
+local stored = tonumber(state[1])
+local current = 0
+local previous = 0
+if stored == index then
+    current = tonumber(state[2]) or 0
+    previous = tonumber(state[3]) or 0
+elseif stored == index - 1 then
+    previous = tonumber(state[2]) or 0
+end
+
+local estimated = previous * (1 - elapsed) + current
+local granted = math.max(0, math.min(requested, math.floor(capacity - estimated)))
+current = current + granted
+local tokens = capacity - estimated - granted
+
+redis.call("HSET", KEYS[1], "window", index, "current", current, "previous", previous)
+redis.call("EXPIRE", KEYS[1], math.ceil(window * 2))
+
+local retry_after = 0
+if tokens < 1 then
+    if previous > 0 and current <= capacity - 1 then
+        local wait = 1 - (capacity - 1 - current) / previous - elapsed
+        retry_after = math.ceil(math.max(0, wait) * window)
+    else
+        retry_after = math.ceil((1 - elapsed) * window)
+    end
+end
+return {granted, tostring(tokens), retry_after}
+"""
+
+# EVALSHA로 실행. 서버에 스크립트가 없으면 자동으로 다시 로드
+token_bucket_script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+gcra_script = redis.register_script(GCRA_SCRIPT)
+sliding_window_script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+# 알고리즘 -> (스크립트, 키 접두사). 알고리즘마다 저장 형식이 달라서 키를 분리한다
+RATE_LIMIT_ALGORITHMS = {
+    "token_bucket": (token_bucket_script, "bucket"),
+    "gcra": (gcra_script, "gcra"),
+    "sliding_window": (sliding_window_script, "window"),
+}
+
+
+# Redis에서 미리 받아둔 토큰(임대). 다 쓰거나 만료되면 다시 Redis에 요청
+class Lease:
+    def __init__(self, tokens: int, remaining: int, retry_after: int, ttl: float):
+        self.tokens = tokens
+        self.remaining = remaining
+        self.retry_after = retry_after
+        self.expire_at = time.monotonic() + ttl
+
+
+# 워커별 클라이언트 IP -> 임대 토큰. 크기 제한 LRU
+class LeaseStore:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.leases: OrderedDict[str, Lease] = OrderedDict()
+
+    # 임대 토큰이 남아 있으면 하나 소비하고 임대 정보 반환
+    def acquire(self, key: str) -> Lease | None:
+        lease = self.leases.get(key)
+        if not lease:
+            return None
+        if lease.tokens <= 0 or time.monotonic() >= lease.expire_at:
+            # 쓰지 않은 토큰은 버린다. 다른 워커에 남은 토큰으로 전체 한도를 넘지 않음
+            del self.leases[key]
+            return None
+        lease.tokens -= 1
+        self.leases.move_to_end(key)
+        return lease
+
+    def add(self, key: str, lease: Lease) -> None:
+        if self.maxsize <= 0 or lease.tokens <= 0:
+            return
+        # 동시에 임대한 요청이 있으면 남은 토큰을 합친다
+        current = self.leases.get(key)
+        if current and time.monotonic() < current.expire_at:
+            lease.tokens += current.tokens
+        self.leases[key] = lease
+        self.leases.move_to_end(key)
+        while len(self.leases) > self.maxsize:
+            self.leases.popitem(last=False)
+
+
+lease_store = LeaseStore(
+    maxsize=config.RATE_LIMIT_LOCAL_BUCKETS, ttl=config.RATE_LIMIT_LEASE_TTL
+)
+
+
+# 처리율 제한 정책. key_by_user면 로그인 유저 단위, 아니면 클라이언트 IP 단위로 버킷을 나눈다
+class RateLimitPolicy:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        bucket_size: float,
+        key_by_user: bool = False,
+    ):
+        self.name = name
+        self.rate = requests_per_minute / 60
+        self.bucket_size = bucket_size
+        self.key_by_user = key_by_user
+        # 한 번에 임대하는 토큰 수. 버킷의 1/10 이하로 제한해서 워커 몇 개가 버킷을 비우지 않게 한다
+        self.lease_size = max(
+            1, min(config.RATE_LIMIT_LEASE_SIZE, int(bucket_size // 10))
+        )
+        self.script, self.key_prefix = RATE_LIMIT_ALGORITHMS[
+            config.RATE_LIMIT_ALGORITHM
+        ]
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+# (메서드, 경로) -> 정책 테이블. 요청마다 dict 조회 한 번으로 정책을 찾는다
+class RateLimitPolicies:
+    def __init__(self) -> None:
+        self.reload()
+
+    # 설정 변경시 호출해서 정책 테이블을 다시 만든다
+    def reload(self) -> None:
+        self.read = RateLimitPolicy(
+            name="read",
+            requests_per_minute=config.REQUESTS_PER_MINUTE,
+            bucket_size=config.BUCKET_SIZE,
+        )
+        self.write = RateLimitPolicy(
+            name="write",
+            requests_per_minute=config.WRITE_REQUESTS_PER_MINUTE,
+            bucket_size=config.WRITE_BUCKET_SIZE,
+            key_by_user=True,
+        )
+        login = RateLimitPolicy(
+            name="login",
+            requests_per_minute=config.LOGIN_REQUESTS_PER_MINUTE,
+            bucket_size=config.LOGIN_BUCKET_SIZE,
+        )
+        upload = RateLimitPolicy(
+            name="upload",
+            requests_per_minute=config.UPLOAD_REQUESTS_PER_MINUTE,
+            bucket_size=config.UPLOAD_BUCKET_SIZE,
+            key_by_user=True,
+        )
+        self.routes = {
+            ("POST", "/users/login"): login,
+            ("POST", "/images/profile"): upload,
+        }
+
+    def match(self, method: str, path: str) -> RateLimitPolicy:
+        policy = self.routes.get((method, path.rstrip("/") or "/"))
+        if policy:
+            return policy
+        return self.read if method in SAFE_METHODS else self.write
+
+
+rate_limit_policies = RateLimitPolicies()
+
+
+# 버킷 키. 쿠키 값을 그대로 쓰면 요청마다 쿠키를 바꿔 새 버킷을 받을 수 있으므로
+# 확인된 세션의 유저 아이디만 쓰고, 확인되지 않으면 IP로 대체
+async def get_bucket_key(scope: Scope, policy: RateLimitPolicy) -> str:
+    if policy.key_by_user:
+        session_id = HTTPConnection(scope).cookies.get("session_id")
+        user_id = await find_verified_user_id(session_id) if session_id else None
+        if user_id:
+            return f"{policy.key_prefix}:{policy.name}:user:{user_id}"
+    return f"{policy.key_prefix}:{policy.name}:ip:{scope['client'][0]}"
+
+
+# 처리율 제한. 알고리즘은 RATE_LIMIT_ALGORITHM으로 선택. BaseHTTPMiddleware 대신 순수 ASGI로 구현해서 요청마다 생기는
+# 태스크/스트림 래핑 비용이 없고 스트리밍 응답도 그대로 전달된다.
+# 토큰은 Redis에서 정책별 lease_size개씩 임대해서 워커 메모리에서 소비하므로
+# 임대 토큰을 다 쓰거나 만료됐을 때만 Redis를 조회한다
+class BucketRateLimitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not scope.get("client"):
+            response = JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": "요청에 client 속성이 없습니다."},
             )
-        client_ip = request.client.host
-        current_time = time.time()
-        bucket_key = f"bucket:{client_ip}"
-        bucket_data = await redis.hgetall(bucket_key)
-        if not bucket_data:
-            bucket = Bucket(tokens=config.BUCKET_SIZE, last_refill=current_time)
-        else:
-            bucket = Bucket.model_validate(bucket_data)
-        time_passed = current_time - bucket.last_refill
+            await response(scope, receive, send)
+            return
+        policy = rate_limit_policies.match(scope["method"], scope["path"])
+        bucket_key = await get_bucket_key(scope, policy)
 
-        # 정수로 계산하기 위해 형변환
-        refill_amount = int(time_passed * (config.REQUESTS_PER_MINUTE / 60))
-        bucket.tokens = min(bucket.tokens + refill_amount, config.BUCKET_SIZE)
-        bucket.last_refill = current_time
+        lease = lease_store.acquire(bucket_key)
+        if lease:
+            allowed = True
+            remaining = lease.remaining + lease.tokens
+            retry_after = lease.retry_after
+        else:
+            granted, tokens, retry_after = await policy.script(
+                keys=[bucket_key],
+                args=[
+                    policy.rate,
+                    policy.bucket_size,
+                    time.time(),
+                    policy.lease_size,
+                ],
+            )
+            allowed = granted > 0
+            remaining = int(float(tokens)) + max(0, granted - 1)
+            # 이번 요청에 하나 쓰고 남은 토큰은 다음 요청을 위해 보관
+            lease_store.add(
+                bucket_key,
+                Lease(
+                    tokens=granted - 1,
+                    remaining=int(float(tokens)),
+                    retry_after=retry_after,
+                    ttl=lease_store.ttl,
+                ),
+            )
 
-        retry_after = max(
-            0, int((1 - bucket.tokens) / (config.REQUESTS_PER_MINUTE / 60))
-        )
-        if bucket.tokens < 1:
-            return JSONResponse(
+        if not allowed:
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": "처리율 제한을 초과하였습니다. 나중에 다시 시도해주세요"
                 },
                 headers={
                     "X-Ratelimit-Retry-After": str(retry_after),
-                    "X-Ratelimit-Remaining": str(bucket.tokens),
-                    "X-Ratelimit-Limit": str(config.BUCKET_SIZE),
+                    "X-Ratelimit-Remaining": str(remaining),
+                    "X-Ratelimit-Limit": str(policy.bucket_size),
                 },
             )
-        await redis.hset(bucket_key, "tokens", bucket.tokens - 1)
-        await redis.hset(bucket_key, "last_refill", current_time)
-        response: Response = await call_next(request)
+            await response(scope, receive, send)
+            return
 
         # 처리율 제한 헤더
-        response.headers.append(key="X-Ratelimit-Remaining", value=str(bucket.tokens))
-        response.headers.append(key="X-Ratelimit-Limit", value=str(config.BUCKET_SIZE))
-        response.headers.append(key="X-Ratelimit-Retry-After", value=str(retry_after))
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Ratelimit-Remaining", str(remaining))
+                headers.append("X-Ratelimit-Limit", str(policy.bucket_size))
+                headers.append("X-Ratelimit-Retry-After", str(retry_after))
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_rate_limit_headers)
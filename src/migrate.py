@@ -0,0 +1,23 @@
+# 스키마 생성/변경(테이블, nullable 컬럼, 인덱스)을 워커 시작과 분리해서 한 번만 실행
+# 실행: PYTHONPATH=./ python -m src.migrate
+import asyncio
+import logging
+
+from src.database import migrate
+
+# 모든 테이블 모델을 metadata에 등록
+from src.domains import (  # noqa: F401
+    comment,
+    image,
+    like,
+    login_session,
+    notification,
+    post,
+    post_stats,
+    post_view,
+    user,
+)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate())
@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+# (created_at, id) 기준 keyset 페이지네이션 커서. 클라이언트에는 불투명한 문자열로 노출
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw_cursor = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        raw_cursor = base64.urlsafe_b64decode(padded_cursor).decode()
+        created_at, id = raw_cursor.split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다"
+        )
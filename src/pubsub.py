@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable
+
+from fastapi import FastAPI
+from redis.exceptions import RedisError
+
+from src.database import redis
+
+logger = logging.getLogger(__name__)
+
+# 채널별 메시지 핸들러. 모든 uvicorn 워커가 같은 채널을 구독해서 워커 간 상태를 맞춘다
+_handlers: dict[str, Callable[[str], None]] = {}
+
+
+def subscribe(channel: str, handler: Callable[[str], None]) -> None:
+    _handlers[channel] = handler
+
+
+async def publish(channel: str, message: str) -> None:
+    await redis.publish(channel, message)
+
+
+def _handle(message: dict) -> None:
+    handler = _handlers.get(message["channel"])
+    if not handler:
+        return
+    # 잘못된 메시지 하나 때문에 구독이 멈추지 않도록 메시지 단위로 처리
+    try:
+        handler(message["data"])
+    except Exception:
+        logger.exception("pub/sub 메시지 처리 실패: %s", message["channel"])
+
+
+async def _listen() -> None:
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(*_handlers)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _handle(message)
+        except RedisError:
+            # 연결이 끊기면 잠시 후 재구독
+            await asyncio.sleep(1)
+        finally:
+            # 이전 구독 연결 반환
+            try:
+                await pubsub.aclose()
+            except RedisError:
+                pass
+
+
+# 앱 실행 중 구독 유지, 종료시 구독 해제
+@asynccontextmanager
+async def pubsub_listener(app: FastAPI):
+    listener = asyncio.create_task(_listen())
+    yield
+    listener.cancel()
@@ -0,0 +1,71 @@
+import json
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import FastAPI
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.database import consistent_hash, redis
+from src.middlewares.rate_limit import rate_limit_policies
+from src.pubsub import publish, subscribe
+
+# 실행 중 변경 가능한 설정. Redis 해시에 저장하고 pub/sub으로 모든 워커에 전파한다
+RUNTIME_CONFIG_KEY = "config:runtime"
+RUNTIME_CONFIG_CHANNEL = "config:runtime"
+RUNTIME_CONFIG_FIELDS = {
+    "REQUESTS_PER_MINUTE": int,
+    "BUCKET_SIZE": float,
+    "WRITE_REQUESTS_PER_MINUTE": int,
+    "WRITE_BUCKET_SIZE": float,
+    "LOGIN_REQUESTS_PER_MINUTE": int,
+    "LOGIN_BUCKET_SIZE": float,
+    "UPLOAD_REQUESTS_PER_MINUTE": int,
+    "UPLOAD_BUCKET_SIZE": float,
+    "VIRTUAL_NODES": int,
+}
+
+
+# 워커 설정에 반영. 정책 테이블과 해시 링은 값이 바뀔 때만 다시 만든다
+def apply_runtime_config(values: dict[str, Any]) -> None:
+    for field, value in values.items():
+        if field in RUNTIME_CONFIG_FIELDS:
+            setattr(config, field, RUNTIME_CONFIG_FIELDS[field](value))
+
+    rate_limit_policies.reload()
+    if consistent_hash.virtual_nodes != config.VIRTUAL_NODES:
+        consistent_hash.set_virtual_nodes(config.VIRTUAL_NODES)
+
+
+def _on_runtime_config(message: str) -> None:
+    apply_runtime_config(json.loads(message))
+
+
+subscribe(RUNTIME_CONFIG_CHANNEL, _on_runtime_config)
+
+
+async def update_runtime_config(values: dict[str, Any]) -> None:
+    values = {
+        field: value
+        for field, value in values.items()
+        if field in RUNTIME_CONFIG_FIELDS and value
+    }
+    if not values:
+        return
+
+    # 새로 시작하는 워커도 같은 값을 읽도록 저장 후 발행
+    await redis.hset(RUNTIME_CONFIG_KEY, mapping=values)  # type: ignore
+    apply_runtime_config(values)
+    await publish(RUNTIME_CONFIG_CHANNEL, json.dumps(values))
+
+
+# 앱 시작시 저장된 설정을 불러온다. Redis 장애시 기본 설정으로 시작
+@asynccontextmanager
+async def runtime_config_loader(app: FastAPI):
+    try:
+        values = await redis.hgetall(RUNTIME_CONFIG_KEY)  # type: ignore
+    except RedisError:
+        values = {}
+    if values:
+        apply_runtime_config(values)
+    yield
@@ -1,19 +1,85 @@
+import logging
 from contextlib import asynccontextmanager
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from fastapi import Depends, FastAPI
+from fastapi import FastAPI
 
+from src.config import config
+from src.database import AsyncSessionLocal
+from src.job_lock import acquire_job_lock
+from src.servicies.auth import AuthService
 from src.servicies.image import ImageService
+from src.servicies.post import PostService
+from src.view_counter import flush_unique_viewers, post_view_buffer
 
+logger = logging.getLogger(__name__)
 
-async def scheduled_image_cleanup(image_service=Depends(ImageService)):
-    image_service = ImageService()
-    await image_service.remove_old_pending_images()
+IMAGE_CLEANUP_SECONDS = 60 * 60 * 24
+POST_STATS_RECONCILE_SECONDS = 60 * 60
+
+
+async def scheduled_image_cleanup():
+    if not await acquire_job_lock("image_cleanup", IMAGE_CLEANUP_SECONDS):
+        return
+    async with AsyncSessionLocal() as session:
+        image_service = ImageService(session=session)
+        await image_service.remove_old_pending_images()
+
+
+# 좋아요/댓글 카운터와 실제 row 개수의 차이 보정
+async def scheduled_post_stats_reconcile():
+    if not await acquire_job_lock("post_stats_reconcile", POST_STATS_RECONCILE_SECONDS):
+        return
+    async with AsyncSessionLocal() as session:
+        post_service = PostService(session=session, read_session=session)
+        await post_service.reconcile_post_stats()
+
+
+# 워커 메모리에 누적된 조회수는 DB에, 순 방문자는 Redis HyperLogLog에 일괄 반영
+async def scheduled_post_view_flush():
+    viewers = post_view_buffer.drain_viewers()
+    if viewers:
+        try:
+            await flush_unique_viewers(viewers)
+        except Exception:
+            post_view_buffer.restore_viewers(viewers)
+
+    view_counts = post_view_buffer.drain_counts()
+    if not view_counts:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            post_service = PostService(session=session, read_session=session)
+            await post_service.flush_post_views(view_counts)
+    except Exception:
+        post_view_buffer.restore_counts(view_counts)
+        raise
+
+
+# 만료된 로그인 세션 삭제
+async def scheduled_session_purge():
+    purged = 0
+    if not await acquire_job_lock("session_purge", config.SESSION_PURGE_SECONDS):
+        return purged
+    async with AsyncSessionLocal() as session:
+        auth_service = AuthService(session=session)
+        purged = await auth_service.purge_expired_sessions()
+    logger.info("만료 세션 %d건 삭제", purged)
+    return purged
 
 
 # 스케줄러 설정
 scheduler = AsyncIOScheduler()
-scheduler.add_job(scheduled_image_cleanup, "interval", hours=24)
+scheduler.add_job(scheduled_image_cleanup, "interval", seconds=IMAGE_CLEANUP_SECONDS)
+scheduler.add_job(
+    scheduled_post_stats_reconcile, "interval", seconds=POST_STATS_RECONCILE_SECONDS
+)
+scheduler.add_job(
+    scheduled_post_view_flush, "interval", seconds=config.POST_VIEW_FLUSH_SECONDS
+)
+scheduler.add_job(
+    scheduled_session_purge, "interval", seconds=config.SESSION_PURGE_SECONDS
+)
 scheduler.start()
 
 
@@ -22,3 +88,5 @@ scheduler.start()
 async def scheduler_shutdown(app: FastAPI):
     yield
     scheduler.shutdown()
+    # 종료 전 남은 조회수 반영
+    await scheduled_post_view_flush()
@@ -3,6 +3,8 @@ from typing import List
 
 from pydantic import BaseModel
 
+from src.schemas.common import Link
+
 
 class CreateCommentRequest(BaseModel):
     post_id: int
@@ -29,6 +31,8 @@ class CommentResponse(BaseModel):
 
 class CommentsResponse(BaseModel):
     comments: List[CommentResponse]
+    # hateos
+    links: list[Link]
 
 
 class EditComment(BaseModel):
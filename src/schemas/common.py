@@ -7,11 +7,6 @@ class Link(BaseModel):
     method: str
 
 
-class Bucket(BaseModel):
-    tokens: float
-    last_refill: float
-
-
 class EditRateLimitRequest(BaseModel):
     requests_per_minute: int | None = None
     bucket_size: int | None = None
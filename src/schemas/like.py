@@ -4,6 +4,7 @@ from typing import List
 from pydantic import BaseModel, Field
 
 from src.domains.user import Role
+from src.schemas.common import Link
 
 
 class CreateLikeRequest(BaseModel):
@@ -27,3 +28,5 @@ class LikeUserResponse(BaseModel):
 
 class GetLikeUsersResponse(BaseModel):
     users: List[LikeUserResponse]
+    # hateos
+    links: list[Link]
@@ -24,6 +24,11 @@ class PostResponse(BaseModel):
     content: str | None = None
     created_at: datetime
     updated_at: datetime
+    # HyperLogLog 기반 근사 순 방문자 수
+    unique_view_count: int = 0
+    today_unique_view_count: int = 0
+    # 로그인한 유저가 좋아요 했으면 좋아요 아이디(취소에 사용)
+    like_id: int | None = None
     # hateos
     links: list[Link]
 
@@ -43,6 +48,9 @@ class PostsResponseBody(BaseModel):
     created_at: datetime
     updated_at: datetime
     view_count: int
+    # HyperLogLog 기반 근사 순 방문자 수
+    unique_view_count: int = 0
+    today_unique_view_count: int = 0
     comment: CommentPartial
     like: LikePartial
     links: list[Link]
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends
+from sqlalchemy import and_, delete, or_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config import config
 from src.database import get_session
 from src.domains.login_session import LoginSession
 from src.schemas.auth import SessionContent
@@ -12,6 +14,7 @@ from src.schemas.auth import SessionContent
 class AuthService:
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         self.session = session
+        self.purge_batch_size = config.SESSION_PURGE_BATCH_SIZE
 
     async def find_session(self, session_id: str | None = None) -> LoginSession | None:
         if not session_id:
@@ -34,7 +37,7 @@ class AuthService:
         content.expire = expire
 
         new_login_session = LoginSession(
-            id=session_id, session_data=content.model_dump_json()
+            id=session_id, session_data=content.model_dump_json(), expires_at=expire
         )
 
         self.session.add(new_login_session)
@@ -45,3 +48,34 @@ class AuthService:
     async def delete_session(self, login_session: LoginSession) -> None:
         await self.session.delete(login_session)
         await self.session.commit()
+
+    # 만료된 세션을 배치 단위로 삭제하고 삭제한 row 수 반환
+    async def purge_expired_sessions(self) -> int:
+        now = datetime.now(timezone.utc)
+        expired = or_(
+            LoginSession.expires_at <= now,  # type: ignore
+            # expires_at 컬럼 추가 전 세션은 생성일 기준 하루(로그인 세션 유효기간)
+            and_(
+                LoginSession.expires_at == None,  # type: ignore # noqa: E711
+                LoginSession.created_at <= now - timedelta(days=1),  # type: ignore
+            ),
+        )
+
+        purged = 0
+        while True:
+            id_result = await self.session.exec(
+                select(LoginSession.id).where(expired).limit(self.purge_batch_size)
+            )
+            ids = id_result.all()
+            if not ids:
+                break
+
+            await self.session.exec(  # type: ignore
+                delete(LoginSession).where(LoginSession.id.in_(ids))  # type: ignore
+            )
+            await self.session.commit()
+            purged += len(ids)
+            if len(ids) < self.purge_batch_size:
+                break
+
+        return purged
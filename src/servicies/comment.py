@@ -1,40 +1,76 @@
+from datetime import datetime
 from typing import List
 
 from fastapi import Depends
+from sqlalchemy import and_, or_, update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.database import get_session
+from src.database import get_read_session, get_session
 from src.domains.comment import Comment
+from src.domains.post_stats import PostStats
 
 
 class CommentService:
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
+    ) -> None:
         self.session = session
+        self.read_session = read_session
         self.items_per_page = 20
 
     async def create_comment(self, user_id: int, post_id: int, content: str) -> Comment:
         new_comment = Comment(author_id=user_id, post_id=post_id, content=content)
 
         self.session.add(new_comment)
+        # 댓글 추가와 같은 트랜잭션에서 카운터 증가
+        await self.session.exec(  # type: ignore
+            update(PostStats)
+            .where(PostStats.post_id == post_id)  # type: ignore
+            .values(comment_count=PostStats.comment_count + 1)
+        )
         await self.session.commit()
         await self.session.refresh(new_comment)
 
         return new_comment
 
     async def get_comments(
-        self, page: int, post_id: int | None = None, user_id: int | None = None
+        self,
+        page: int,
+        post_id: int | None = None,
+        user_id: int | None = None,
+        cursor: tuple[datetime, int] | None = None,
+        primary: bool = False,
     ) -> List[Comment]:
-        offset = (page - 1) * self.items_per_page
-        orm_query = select(Comment)
+        orm_query = select(Comment).order_by(
+            Comment.created_at, Comment.id  # type: ignore
+        )
 
         if post_id:
             orm_query = orm_query.where(Comment.post_id == post_id)
         if user_id:
             orm_query = orm_query.where(Comment.author_id == user_id)
-        orm_query = orm_query.offset(offset).limit(self.items_per_page)
 
-        result = await self.session.exec(orm_query)
+        # cursor가 있으면 OFFSET 없이 (created_at, id) 다음 row부터 조회
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            orm_query = orm_query.where(
+                or_(
+                    Comment.created_at > cursor_created_at,  # type: ignore
+                    and_(
+                        Comment.created_at == cursor_created_at,  # type: ignore
+                        Comment.id > cursor_id,  # type: ignore
+                    ),
+                )
+            )
+        else:
+            orm_query = orm_query.offset((page - 1) * self.items_per_page)
+        orm_query = orm_query.limit(self.items_per_page)
+
+        session = self.session if primary else self.read_session
+        result = await session.exec(orm_query)
         comments = result.all()
 
         return list(comments)
@@ -56,4 +92,12 @@ class CommentService:
 
     async def delete_comment(self, comment: Comment) -> None:
         await self.session.delete(comment)
+        await self.session.exec(  # type: ignore
+            update(PostStats)
+            .where(
+                PostStats.post_id == comment.post_id,  # type: ignore
+                PostStats.comment_count > 0,  # type: ignore
+            )
+            .values(comment_count=PostStats.comment_count - 1)
+        )
         await self.session.commit()
@@ -1,17 +1,39 @@
 from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, List
 
 from fastapi import Depends
+from redis.exceptions import RedisError
+from sqlalchemy import Row, and_, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
 
-from src.database import get_session
+from src.config import config
+from src.database import get_read_session, get_session
 from src.domains.like import Like
+from src.domains.notification import Notification
+from src.domains.post_stats import PostStats
 from src.domains.user import User
+from src.like_cache import (
+    add_liker,
+    count_likers,
+    get_likers_versions,
+    is_liker,
+    load_likers,
+    remove_liker,
+)
 
 
 class LikeServiceBase(metaclass=ABCMeta):
+    items_per_page: int
+
+    # 이미 좋아요 한 포스트면 None
     @abstractmethod
-    async def create_like(self, user_id: int, post_id: int) -> Like:
+    async def create_like(
+        self, user_id: int, post_id: int, target_user_id: int
+    ) -> Like | None:
         pass
 
     @abstractmethod
@@ -24,8 +46,21 @@ class LikeServiceBase(metaclass=ABCMeta):
     async def get_like(self, like_id: int) -> Like | None:
         pass
 
+    # {post_id: 좋아요 수}
+    @abstractmethod
+    async def get_like_counts(self, post_ids: list[int]) -> dict[int, int]:
+        pass
+
+    @abstractmethod
+    async def get_liked_users(
+        self,
+        post_id: int | None = None,
+        cursor: tuple[datetime, int] | None = None,
+    ) -> List[Row]:
+        pass
+
     @abstractmethod
-    async def get_liked_users(self, post_id: int | None = None) -> list[User]:
+    def stream_liked_users(self, post_id: int | None = None) -> AsyncIterator[Row]:
         pass
 
     @abstractmethod
@@ -34,20 +69,71 @@ class LikeServiceBase(metaclass=ABCMeta):
 
 
 class LikeService(LikeServiceBase):
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
+    ) -> None:
         self.session = session
+        self.read_session = read_session
+        self.items_per_page = 20
 
-    async def create_like(self, user_id: int, post_id: int) -> Like:
+    # (user_id, post_id) unique 인덱스에 맡겨서 조회 없이 바로 추가. 동시 요청에도 하나만 추가된다
+    async def create_like(
+        self, user_id: int, post_id: int, target_user_id: int
+    ) -> Like | None:
         new_like = Like(user_id=user_id, post_id=post_id)
         self.session.add(new_like)
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            await self.session.rollback()
+            # 이미 좋아요 했으면 None. 그 외(삭제된 포스트의 외래키 위반 등)는 호출한 쪽에서 처리
+            result = await self.session.exec(
+                select(Like.id).where(Like.user_id == user_id, Like.post_id == post_id)
+            )
+            if result.first():
+                return None
+            raise
+
+        # 좋아요 추가와 같은 트랜잭션에서 카운터 증가, 알림 추가
+        await self.session.exec(  # type: ignore
+            update(PostStats)
+            .where(PostStats.post_id == post_id)  # type: ignore
+            .values(like_count=PostStats.like_count + 1)
+        )
+        self.session.add(
+            Notification(
+                target_user_id=target_user_id, actor_user_id=user_id, post_id=post_id
+            )
+        )
         await self.session.commit()
+        # created_at은 DB 서버 시각(now())으로 저장되므로 다시 읽는다
         await self.session.refresh(new_like)
 
+        if config.LIKE_CACHE_ENABLED:
+            try:
+                await add_liker(post_id, user_id)
+            except RedisError:
+                pass
+
         return new_like
 
     async def get_like_by_user_and_post(
         self, user_id: int, post_id: int
     ) -> Like | None:
+        # 좋아요 하지 않았으면 Redis 집합에서 바로 응답
+        if config.LIKE_CACHE_ENABLED:
+            try:
+                liked = await is_liker(post_id, user_id)
+                if liked is None:
+                    likers = await self._load_likers([post_id])
+                    liked = user_id in likers[post_id]
+            except RedisError:
+                liked = True
+            if not liked:
+                return None
+
         result = await self.session.exec(
             select(Like).where(Like.user_id == user_id, Like.post_id == post_id)
         )
@@ -62,15 +148,115 @@ class LikeService(LikeServiceBase):
 
         return like
 
-    async def get_liked_users(self, post_id: int | None = None) -> list[User]:
-        orm_query = select(User).join(Like)
+    # Redis 집합에 없는 포스트만 like 테이블에서 불러온다
+    async def get_like_counts(self, post_ids: list[int]) -> dict[int, int]:
+        try:
+            like_counts = await count_likers(post_ids)
+            cold_post_ids = [
+                post_id for post_id in post_ids if post_id not in like_counts
+            ]
+            if cold_post_ids:
+                likers = await self._load_likers(cold_post_ids)
+                like_counts.update(
+                    {post_id: len(user_ids) for post_id, user_ids in likers.items()}
+                )
+        except RedisError:
+            return {}
+
+        return like_counts
+
+    # like 테이블을 읽기 전 버전을 확인해서, 읽는 사이 추가/취소된 포스트는 집합을 만들지 않는다.
+    # 버전은 primary 커밋 후에 오르므로 replica가 아닌 primary에서 읽어야 확인이 맞다
+    async def _load_likers(self, post_ids: list[int]) -> dict[int, set[int]]:
+        versions = await get_likers_versions(post_ids)
+        likers = await self._find_likers(post_ids)
+        await load_likers(likers, versions)
+
+        return likers
+
+    async def _find_likers(self, post_ids: list[int]) -> dict[int, set[int]]:
+        orm_query = select(Like.post_id, Like.user_id).where(
+            Like.post_id.in_(post_ids)  # type: ignore
+        )
+        result = await self.session.exec(orm_query)
+        likers: dict[int, set[int]] = {post_id: set() for post_id in post_ids}
+        for post_id, user_id in result.all():
+            likers[post_id].add(user_id)
+
+        return likers
+
+    # 좋아요 순서(created_at, id)로 정렬한 유저 컬럼. 엔티티 대신 컬럼만 읽어 세션에 객체를 쌓지 않는다
+    def _liked_users_query(
+        self, post_id: int | None = None, cursor: tuple[datetime, int] | None = None
+    ) -> Select:
+        orm_query = (
+            select(  # type: ignore
+                User.id,
+                User.nickname,
+                User.role,
+                User.created_at,
+                User.updated_at,
+                Like.id.label("like_id"),  # type: ignore
+                Like.created_at.label("liked_at"),  # type: ignore
+            )
+            .join(Like, Like.user_id == User.id)  # type: ignore
+            .order_by(Like.created_at, Like.id)
+        )
         if post_id:
             orm_query = orm_query.where(Like.post_id == post_id)
-        result = await self.session.exec(orm_query)
+
+        # cursor가 있으면 (created_at, id) 다음 좋아요부터 조회
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            orm_query = orm_query.where(
+                or_(
+                    Like.created_at > cursor_created_at,  # type: ignore
+                    and_(
+                        Like.created_at == cursor_created_at,  # type: ignore
+                        Like.id > cursor_id,  # type: ignore
+                    ),
+                )
+            )
+
+        return orm_query  # type: ignore
+
+    async def get_liked_users(
+        self,
+        post_id: int | None = None,
+        cursor: tuple[datetime, int] | None = None,
+    ) -> List[Row]:
+        orm_query = self._liked_users_query(post_id=post_id, cursor=cursor)
+        result = await self.read_session.exec(orm_query.limit(self.items_per_page))
         like_users = result.all()
 
         return list(like_users)
 
+    # 요청 세션은 응답 전송 전에 닫히므로 같은 DB에 세션을 새로 열고 서버 측 커서로 한 row씩 읽는다
+    async def stream_liked_users(
+        self, post_id: int | None = None
+    ) -> AsyncIterator[Row]:
+        async with AsyncSession(self.read_session.bind) as session:
+            result = await session.stream(self._liked_users_query(post_id=post_id))
+            try:
+                async for like_user in result:
+                    yield like_user
+            finally:
+                await result.close()
+
     async def delete_like(self, like: Like) -> None:
         await self.session.delete(like)
+        await self.session.exec(  # type: ignore
+            update(PostStats)
+            .where(
+                PostStats.post_id == like.post_id,  # type: ignore
+                PostStats.like_count > 0,  # type: ignore
+            )
+            .values(like_count=PostStats.like_count - 1)
+        )
         await self.session.commit()
+
+        if config.LIKE_CACHE_ENABLED:
+            try:
+                await remove_liker(like.post_id, like.user_id)
+            except RedisError:
+                pass
@@ -4,7 +4,7 @@ from fastapi import Depends
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.database import get_session
+from src.database import get_read_session, get_session
 from src.domains.notification import Notification
 
 
@@ -21,8 +21,13 @@ class NotificationServiceBase(metaclass=ABCMeta):
 
 
 class NotificationService(NotificationServiceBase):
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
+    ) -> None:
         self.session = session
+        self.read_session = read_session
 
     async def create_notification(
         self, user_id: int, actor_user_id: int, post_id: int
@@ -37,7 +42,7 @@ class NotificationService(NotificationServiceBase):
         return new_notification
 
     async def get_notifications_by_user_id(self, user_id: int) -> list[Notification]:
-        result = await self.session.exec(
+        result = await self.read_session.exec(
             select(Notification).where(Notification.target_user_id == user_id)
         )
         notifications = result.all()
@@ -1,20 +1,31 @@
+from datetime import datetime
 from typing import List
 
 from fastapi import Depends
-from sqlalchemy import update
+from sqlalchemy import Row, and_, bindparam, exists, insert, or_, update
 from sqlalchemy.orm import selectinload
-from sqlmodel import select
+from sqlmodel import func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.database import get_session
+from src.database import get_read_session, get_session
+from src.domains.comment import Comment
+from src.domains.like import Like
 from src.domains.post import Post
+from src.domains.post_stats import PostStats
 from src.domains.post_view import PostView
+from src.domains.user import User
 
 
 class PostService:
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
+    ) -> None:
         self.session = session
+        self.read_session = read_session
         self.items_per_page = 20
+        self.reconcile_batch_size = 1000
 
     async def create_post(self, user_id: int, title: str, content: str) -> Post:
         new_post = Post(
@@ -22,49 +33,78 @@ class PostService:
             title=title,
             content=content,
         )
+        # 조회수/통계 row는 relationship으로 함께 추가해서 한 트랜잭션, 한 번의 flush로 저장
+        new_post.post_view = PostView()
+        new_post.post_stats = PostStats()
         self.session.add(new_post)
         await self.session.commit()
-        await self.session.refresh(new_post)
-        new_post_view = PostView(post_id=new_post.id)
-        self.session.add(new_post_view)
-        await self.session.commit()
-        await self.session.refresh(new_post_view)
-        await self.session.refresh(new_post)
 
         return new_post
 
-    async def get_posts(self, page: int) -> List[Post]:
-        offset = (page - 1) * self.items_per_page
-        result = await self.session.exec(
-            select(Post)
-            .options(
-                selectinload(Post.comments),  # type: ignore
-                selectinload(Post.user),  # type: ignore
-                selectinload(Post.likes),  # type: ignore
-                selectinload(Post.post_view),  # type: ignore
+    # 캐시에 저장할 목록은 primary=True로 쓰기 세션에서 조회
+    async def get_posts_with_counts(
+        self,
+        page: int,
+        cursor: tuple[datetime, int] | None = None,
+        primary: bool = False,
+    ) -> List[Row]:
+        orm_query = (
+            select(  # type: ignore
+                Post.id,
+                Post.title,
+                Post.created_at,
+                Post.updated_at,
+                User.nickname.label("author"),  # type: ignore
+                # 좋아요/댓글 작성시 갱신되는 PostStats에서 개수를 읽는다
+                func.coalesce(PostStats.comment_count, 0).label("comment_count"),
+                func.coalesce(PostStats.like_count, 0).label("like_count"),
+                func.coalesce(PostView.count, 0).label("view_count"),
             )
-            .offset(offset)
-            .limit(self.items_per_page)
+            .join(User, User.id == Post.author_id)  # type: ignore
+            .outerjoin(PostStats, PostStats.post_id == Post.id)  # type: ignore
+            .outerjoin(PostView, PostView.post_id == Post.id)  # type: ignore
+            .order_by(Post.created_at, Post.id)
         )
+
+        # cursor가 있으면 OFFSET 없이 (created_at, id) 다음 row부터 조회
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            orm_query = orm_query.where(
+                or_(
+                    Post.created_at > cursor_created_at,  # type: ignore
+                    and_(
+                        Post.created_at == cursor_created_at,  # type: ignore
+                        Post.id > cursor_id,  # type: ignore
+                    ),
+                )
+            )
+        else:
+            orm_query = orm_query.offset((page - 1) * self.items_per_page)
+
+        session = self.session if primary else self.read_session
+        result = await session.exec(orm_query.limit(self.items_per_page))
         posts = result.all()
 
         return list(posts)
 
-    async def increase_post_view(self, post_id: int) -> None:
-        result = await self.session.exec(
-            select(PostView).where(PostView.post_id == post_id)
+    async def flush_post_views(self, view_counts: dict[int, int]) -> None:
+        # 누적된 조회수를 executemany UPDATE 한 번으로 반영
+        post_view_table = PostView.__table__  # type: ignore
+        await self.session.exec(  # type: ignore
+            update(post_view_table)
+            .where(post_view_table.c.post_id == bindparam("b_post_id"))
+            .values(count=post_view_table.c.count + bindparam("b_count")),
+            params=[
+                {"b_post_id": post_id, "b_count": count}
+                for post_id, count in view_counts.items()
+            ],
         )
-        post_view = result.first()
-        if post_view:
-            await self.session.exec(  # type: ignore
-                update(PostView)
-                .where(PostView.post_id == post_id)  # type: ignore
-                .values(count=PostView.count + 1)
-            )
         await self.session.commit()
 
-    async def get_post(self, post_id: int) -> Post | None:
-        result = await self.session.exec(
+    # 수정/삭제하거나 캐시에 저장할 포스트는 primary=True로 쓰기 세션에서 조회
+    async def get_post(self, post_id: int, primary: bool = False) -> Post | None:
+        session = self.session if primary else self.read_session
+        result = await session.exec(
             select(Post)
             .options(  # type: ignore
                 selectinload(Post.user),  # type: ignore
@@ -95,5 +135,66 @@ class PostService:
         post_view = post_view_result.first()
         if post_view:
             await self.session.delete(post_view)
+        post_stats_result = await self.session.exec(
+            select(PostStats).where(PostStats.post_id == post.id)
+        )
+        post_stats = post_stats_result.first()
+        if post_stats:
+            await self.session.delete(post_stats)
         await self.session.delete(post)
         await self.session.commit()
+
+    async def reconcile_post_stats(self) -> int:
+        # 통계 row가 없는 포스트(기존 데이터 등)에 row 생성
+        await self.session.exec(  # type: ignore
+            insert(PostStats).from_select(
+                ["post_id"],
+                select(Post.id).where(
+                    ~exists().where(PostStats.post_id == Post.id)  # type: ignore
+                ),
+            )
+        )
+        await self.session.commit()
+
+        like_count = (
+            select(func.count(Like.id))  # type: ignore
+            .where(Like.post_id == PostStats.post_id)
+            .scalar_subquery()
+        )
+        comment_count = (
+            select(func.count(Comment.id))  # type: ignore
+            .where(Comment.post_id == PostStats.post_id)
+            .scalar_subquery()
+        )
+
+        # 실제 개수와 어긋난 row만 배치 단위로 보정
+        repaired = 0
+        last_id = 0
+        while True:
+            id_result = await self.session.exec(
+                select(PostStats.id)
+                .where(PostStats.id > last_id)  # type: ignore
+                .order_by(PostStats.id)  # type: ignore
+                .limit(self.reconcile_batch_size)
+            )
+            ids = id_result.all()
+            if not ids:
+                break
+
+            result = await self.session.exec(  # type: ignore
+                update(PostStats)
+                .where(
+                    PostStats.id.in_(ids),  # type: ignore
+                    or_(
+                        PostStats.like_count != like_count,  # type: ignore
+                        PostStats.comment_count != comment_count,  # type: ignore
+                    ),
+                )
+                .values(like_count=like_count, comment_count=comment_count)
+                .execution_options(synchronize_session=False)
+            )
+            repaired += result.rowcount
+            await self.session.commit()
+            last_id = ids[-1]  # type: ignore
+
+        return repaired
@@ -0,0 +1,238 @@
+import logging
+from abc import ABCMeta, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Depends
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+from ulid import ULID
+
+from src.cache import invalidate_key, local_cache
+from src.config import config
+from src.database import redis
+from src.schemas.auth import SessionContent
+from src.servicies.auth import AuthService
+
+logger = logging.getLogger(__name__)
+
+
+class SessionBackendBase(metaclass=ABCMeta):
+    # 세션 생성 후 쿠키에 넣을 세션 아이디 반환
+    @abstractmethod
+    async def create_session(
+        self,
+        content: SessionContent,
+        expires_delta: timedelta,
+        session_id: str | None = None,
+    ) -> str:
+        pass
+
+    @abstractmethod
+    async def get_session_content(self, session_id: str) -> SessionContent | None:
+        pass
+
+    # 세션이 없으면 False
+    @abstractmethod
+    async def delete_session(self, session_id: str) -> bool:
+        pass
+
+
+def session_cache_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+# 워커 메모리(L1) -> Redis 순서로 캐시된 세션 조회. 캐시에 없으면 None
+async def find_cached_session_content(session_id: str) -> SessionContent | None:
+    cache_key = session_cache_key(session_id)
+    cached = local_cache.get(cache_key)
+    if cached:
+        return SessionContent.model_validate(cached)
+
+    try:
+        session_data = await redis.get(cache_key)
+    except RedisError:
+        return None
+    if not session_data:
+        return None
+
+    session_content = SessionContent.model_validate_json(session_data)
+    local_cache.set(cache_key, session_content.model_dump(mode="json"))
+    return session_content
+
+
+# loginsession 테이블 세션. 워커 메모리(L1) -> Redis -> DB 순서로 조회
+class DatabaseSessionBackend(SessionBackendBase):
+    def __init__(self, service: AuthService) -> None:
+        self.service = service
+
+    async def create_session(
+        self,
+        content: SessionContent,
+        expires_delta: timedelta,
+        session_id: str | None = None,
+    ) -> str:
+        # 유효한 세션으로 다시 로그인하면 같은 세션 아이디를 갱신
+        login_session = await self.service.find_session(session_id)
+        if login_session and session_id:
+            await self.service.delete_session(login_session)
+            await self.evict_session(session_id)
+        else:
+            session_id = str(ULID.from_datetime(datetime.now()))
+
+        return await self.service.insert_session(
+            session_id=session_id, content=content, expires_delta=expires_delta
+        )
+
+    # Redis에는 세션 만료 시각까지만 저장
+    async def get_session_content(self, session_id: str) -> SessionContent | None:
+        session_content = await find_cached_session_content(session_id)
+        if session_content:
+            return session_content
+
+        login_session = await self.service.find_session(session_id)
+        if not login_session:
+            return None
+        session_content = SessionContent.model_validate_json(login_session.session_data)
+
+        cache_key = session_cache_key(session_id)
+        ttl = 0
+        if session_content.expire:
+            ttl = int(
+                (session_content.expire - datetime.now(tz=timezone.utc)).total_seconds()
+            )
+        if ttl > 0:
+            try:
+                await redis.setex(
+                    name=cache_key, time=ttl, value=login_session.session_data
+                )
+            except RedisError:
+                pass
+
+        local_cache.set(cache_key, session_content.model_dump(mode="json"))
+        return session_content
+
+    async def delete_session(self, session_id: str) -> bool:
+        login_session = await self.service.find_session(session_id)
+        if not login_session:
+            return False
+
+        await self.service.delete_session(login_session)
+        await self.evict_session(session_id)
+        return True
+
+    # 모든 워커의 세션 캐시 제거. Redis 장애시에도 DB 삭제 결과를 기준으로 처리한다
+    async def evict_session(self, session_id: str) -> None:
+        try:
+            await invalidate_key(redis, session_cache_key(session_id))
+        except RedisError:
+            local_cache.delete(session_cache_key(session_id))
+
+
+def revoked_session_key(jti: str) -> str:
+    return f"session:revoked:{jti}"
+
+
+# 서명된 토큰(HS256 JWT)에 세션 내용을 담는 무상태 세션. 요청마다 세션 저장소를 조회하지 않는다.
+# 로그아웃한 토큰은 만료 시각까지 Redis 폐기 목록에 보관(SESSION_REVOCATION_ENABLED)
+class SignedSessionBackend(SessionBackendBase):
+    algorithm = "HS256"
+
+    # SESSION_SECRET_KEY는 설정 로드시 확인
+    def __init__(self) -> None:
+        self.secret_key = config.SESSION_SECRET_KEY
+
+    async def create_session(
+        self,
+        content: SessionContent,
+        expires_delta: timedelta,
+        session_id: str | None = None,
+    ) -> str:
+        content.expire = datetime.now(tz=timezone.utc) + expires_delta
+        claims = {
+            "sub": str(content.id),
+            "nickname": content.nickname,
+            "role": content.role.value,
+            "exp": int(content.expire.timestamp()),
+            "jti": str(ULID()),
+        }
+        token: str = jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+        return token
+
+    def _decode(self, session_id: str) -> dict | None:
+        try:
+            # 만료 여부는 get_current_user에서 확인
+            claims: dict = jwt.decode(
+                session_id,
+                self.secret_key,
+                algorithms=[self.algorithm],
+                options={"verify_exp": False},
+            )
+        except JWTError:
+            return None
+        return claims
+
+    async def get_session_content(self, session_id: str) -> SessionContent | None:
+        claims = self._decode(session_id)
+        if not claims:
+            return None
+
+        if config.SESSION_REVOCATION_ENABLED:
+            try:
+                revoked = await redis.exists(revoked_session_key(claims["jti"]))
+            except RedisError:
+                # 폐기 목록을 확인할 수 없으면 SESSION_REVOCATION_FAIL_OPEN 정책을 따른다
+                revoked = not config.SESSION_REVOCATION_FAIL_OPEN
+            if revoked:
+                return None
+
+        return SessionContent(
+            id=int(claims["sub"]),
+            nickname=claims["nickname"],
+            role=claims["role"],
+            expire=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        )
+
+    async def delete_session(self, session_id: str) -> bool:
+        claims = self._decode(session_id)
+        if not claims:
+            return False
+
+        ttl = int(claims["exp"] - datetime.now(tz=timezone.utc).timestamp())
+        if config.SESSION_REVOCATION_ENABLED and ttl > 0:
+            try:
+                await redis.setex(
+                    name=revoked_session_key(claims["jti"]), time=ttl, value=1
+                )
+            except RedisError:
+                # 쿠키는 삭제되지만 토큰은 만료 시각까지 유효
+                logger.warning("세션 폐기 목록 저장 실패: %s", claims["jti"])
+        return True
+
+
+# 요청 처리 전(처리율 제한)에 쓰는 유저 확인. DB는 조회하지 않고 서명을 검증한 토큰이나 캐시된 세션만 인정
+async def find_verified_user_id(session_id: str) -> int | None:
+    try:
+        if config.SESSION_BACKEND == "signed":
+            session_content = await SignedSessionBackend().get_session_content(
+                session_id
+            )
+        else:
+            session_content = await find_cached_session_content(session_id)
+    except RedisError:
+        return None
+
+    if not session_content:
+        return None
+    if session_content.expire and session_content.expire <= datetime.now(
+        tz=timezone.utc
+    ):
+        return None
+    return session_content.id
+
+
+def get_session_backend(
+    service: AuthService = Depends(AuthService),
+) -> SessionBackendBase:
+    if config.SESSION_BACKEND == "signed":
+        return SignedSessionBackend()
+    return DatabaseSessionBackend(service)
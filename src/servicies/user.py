@@ -4,7 +4,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth import hash_password
+from src.auth import hash_password_async
 from src.database import get_session
 from src.domains.image import Image, State, UseType
 from src.domains.user import User
@@ -17,7 +17,7 @@ class UserService:
     async def signup_account(
         self, nickname: str, password: str, img_id: int | None = None
     ) -> User:
-        hashed_password = hash_password(plain_password=password)
+        hashed_password = await hash_password_async(plain_password=password)
         new_user = User(nickname=nickname, password=hashed_password)
 
         self.session.add(new_user)
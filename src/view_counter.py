@@ -0,0 +1,75 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from src.database import redis
+
+# 일별 순 방문자 키 보관 기간(초)
+DAILY_VIEWERS_TTL = 60 * 60 * 24 * 2
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+
+def _viewers_key(post_id: int) -> str:
+    return f"post:{post_id}:viewers"
+
+
+def _daily_viewers_key(post_id: int, day: str) -> str:
+    return f"post:{post_id}:viewers:{day}"
+
+
+# 포스트 조회수 쓰기 지연 버퍼. 조회 요청은 워커 메모리에만 누적하고 스케줄러가 DB/Redis에 일괄 반영
+class PostViewBuffer:
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+        self.viewers: defaultdict[tuple[int, str], set[str]] = defaultdict(set)
+
+    def add(self, post_id: int, viewer: str) -> None:
+        self.counts[post_id] += 1
+        self.viewers[(post_id, _today())].add(viewer)
+
+    def drain_counts(self) -> dict[int, int]:
+        counts, self.counts = self.counts, Counter()
+        return dict(counts)
+
+    def drain_viewers(self) -> dict[tuple[int, str], set[str]]:
+        viewers, self.viewers = self.viewers, defaultdict(set)
+        return dict(viewers)
+
+    # 반영 실패시 다음 주기에 다시 반영되도록 되돌림
+    def restore_counts(self, counts: dict[int, int]) -> None:
+        self.counts.update(counts)
+
+    def restore_viewers(self, viewers: dict[tuple[int, str], set[str]]) -> None:
+        for key, post_viewers in viewers.items():
+            self.viewers[key].update(post_viewers)
+
+
+post_view_buffer = PostViewBuffer()
+
+
+# 순 방문자는 HyperLogLog로 집계. 방문자 수와 관계없이 포스트당 최대 12KB
+async def flush_unique_viewers(viewers: dict[tuple[int, str], set[str]]) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for (post_id, day), post_viewers in viewers.items():
+            daily_key = _daily_viewers_key(post_id, day)
+            pipe.pfadd(_viewers_key(post_id), *post_viewers)
+            pipe.pfadd(daily_key, *post_viewers)
+            pipe.expire(daily_key, DAILY_VIEWERS_TTL)
+        await pipe.execute()
+
+
+# 포스트별 (전체 순 방문자 수, 오늘 순 방문자 수)
+async def count_unique_viewers(post_ids: list[int]) -> dict[int, tuple[int, int]]:
+    today = _today()
+    async with redis.pipeline(transaction=False) as pipe:
+        for post_id in post_ids:
+            pipe.pfcount(_viewers_key(post_id))
+            pipe.pfcount(_daily_viewers_key(post_id, today))
+        results = await pipe.execute()
+
+    return {
+        post_id: (results[index * 2], results[index * 2 + 1])
+        for index, post_id in enumerate(post_ids)
+    }
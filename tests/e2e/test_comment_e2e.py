@@ -11,6 +11,7 @@ from src.config import config
 from src.database import get_session
 from src.domains.comment import Comment
 from src.domains.post import Post
+from src.domains.post_stats import PostStats
 from src.domains.post_view import PostView
 from src.domains.user import Role, User
 from src.main import app
@@ -83,6 +84,52 @@ async def test_create_comment_ok(
     assert post.content == "test_comment"
 
 
+# 댓글 작성시 캐시된 포스트 목록의 댓글 수 갱신
+@pytest.mark.asyncio
+@pytest.mark.create
+async def test_create_comment_refresh_posts_comment_count(
+    test_client: AsyncClient, test_session: AsyncSession
+) -> None:
+    # given
+    user_result = await test_session.exec(
+        select(User).where(User.nickname == "test_user")
+    )
+    user = user_result.first()
+    test_session.add(
+        Post(
+            id=1,
+            author_id=user.id,
+            title="test_title_1",
+            content="test_content_1",
+        )
+    )
+    test_session.add(PostView(post_id=1))
+    test_session.add(PostStats(post_id=1))
+    await test_session.commit()
+    await test_client.post(
+        "/users/login",
+        json={
+            "nickname": "test_user",
+            "password": "Test_password",
+        },
+    )
+    before = await test_client.get("/posts/")
+
+    # when
+    await test_client.post(
+        "/comments/",
+        json={
+            "post_id": 1,
+            "content": "test_comment",
+        },
+    )
+    response = await test_client.get("/posts/")
+
+    # then
+    assert before.json()["posts"][0]["comment"]["count"] == 0
+    assert response.json()["posts"][0]["comment"]["count"] == 1
+
+
 @pytest.mark.asyncio
 @pytest.mark.create
 async def test_create_comment_invalid_params(
@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth import hash_password
+from src.domains.comment import Comment
+from src.domains.image import Image, State
+from src.domains.like import Like
+from src.domains.login_session import LoginSession
+from src.domains.notification import Notification
+from src.domains.post import Post
+from src.domains.post_stats import PostStats
+from src.domains.post_view import PostView
+from src.domains.user import User
+from src.servicies.auth import AuthService
+from src.servicies.comment import CommentService
+from src.servicies.image import ImageService
+from src.servicies.like import LikeService
+from src.servicies.notification import NotificationService
+from src.servicies.post import PostService
+from src.servicies.user import UserService
+
+
+# 행이 거의 없으면 옵티마이저가 인덱스 대신 풀스캔을 고르므로 테이블마다 수백 행을 넣고 통계 갱신
+@pytest_asyncio.fixture
+async def test_data(test_session: AsyncSession) -> AsyncGenerator[None, None]:
+    now = datetime.now()
+    password = hash_password("Test_password")
+    user_count, post_count = 200, 500
+
+    await test_session.exec(  # type: ignore
+        insert(User),
+        params=[
+            {"nickname": f"user_{index}", "password": password, "updated_at": now}
+            for index in range(1, user_count + 1)
+        ],
+    )
+    await test_session.exec(  # type: ignore
+        insert(Post),
+        params=[
+            {
+                "title": "제목",
+                "content": "내용",
+                "author_id": index % user_count + 1,
+                "created_at": now - timedelta(minutes=index),
+                "updated_at": now,
+            }
+            for index in range(1, post_count + 1)
+        ],
+    )
+    post_ids = range(1, post_count + 1)
+    await test_session.exec(  # type: ignore
+        insert(PostView), params=[{"post_id": post_id} for post_id in post_ids]
+    )
+    await test_session.exec(  # type: ignore
+        insert(PostStats), params=[{"post_id": post_id} for post_id in post_ids]
+    )
+    await test_session.exec(  # type: ignore
+        insert(Comment),
+        params=[
+            {
+                "content": "댓글",
+                "author_id": index % user_count + 1,
+                "post_id": index % post_count + 1,
+                "updated_at": now,
+            }
+            for index in range(1000)
+        ],
+    )
+    # 유저마다 서로 다른 포스트 5개에 좋아요
+    likes = [
+        {
+            "user_id": user_id,
+            "post_id": (user_id * 5 + offset) % post_count + 1,
+            "created_at": now - timedelta(seconds=user_id * 5 + offset),
+        }
+        for user_id in range(1, user_count + 1)
+        for offset in range(5)
+    ]
+    await test_session.exec(insert(Like), params=likes)  # type: ignore
+    await test_session.exec(  # type: ignore
+        insert(Notification),
+        params=[
+            {
+                "target_user_id": user_id % user_count + 1,
+                "actor_user_id": user_id,
+                "post_id": (user_id * 5 + offset) % post_count + 1,
+            }
+            for user_id in range(1, user_count + 1)
+            for offset in range(5)
+        ],
+    )
+    await test_session.exec(  # type: ignore
+        insert(Image),
+        params=[
+            {
+                "name": f"profile_{user_id}.png",
+                "user_id": user_id,
+                "state": State.PENDING if user_id % 20 == 0 else State.ACTIVE,
+            }
+            for user_id in range(1, user_count + 1)
+        ],
+    )
+    await test_session.exec(  # type: ignore
+        insert(LoginSession),
+        params=[
+            {
+                "id": f"session_{index}",
+                "session_data": "{}",
+                "expires_at": now + timedelta(days=1 if index % 20 else -1),
+            }
+            for index in range(user_count)
+        ],
+    )
+    await test_session.commit()
+
+    connection = await test_session.connection()
+    await connection.exec_driver_sql(
+        "ANALYZE TABLE `user`, post, postview, poststats, comment, `like`, "
+        "notification, image, loginsession"
+    )
+    await test_session.commit()
+
+    yield
+
+
+# 서비스 메서드가 실행한 SELECT/UPDATE/DELETE 수집
+@pytest_asyncio.fixture
+async def executed_queries(
+    test_engine: AsyncEngine,
+) -> AsyncGenerator[list[tuple[str, tuple]], None]:
+    queries: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE")
+        ):
+            queries.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    yield queries
+    event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+
+# 실제로 선택된 인덱스(key) 없이 테이블을 읽는 쿼리. 사용 가능한 인덱스(possible_keys)가 있어도
+# 옵티마이저가 고르지 않으면 풀스캔이다. 서브쿼리 결과 등 임시 테이블(<...>)과 읽을 테이블이 없는 행은 제외
+async def find_full_scans(
+    session: AsyncSession, queries: list[tuple[str, tuple]]
+) -> list[str]:
+    connection = await session.connection()
+    full_scans = []
+    for statement, parameters in queries:
+        result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        for row in result.mappings():
+            if not row["table"] or row["table"].startswith("<") or not row["type"]:
+                continue
+            if not row["key"]:
+                full_scans.append(f"{row['table']} ({row['type']}): {statement}")
+    return full_scans
+
+
+# 서비스 쿼리가 인덱스 없이 풀스캔하지 않는지 확인
+@pytest.mark.asyncio
+@pytest.mark.index
+async def test_service_queries_use_index(
+    test_session: AsyncSession,
+    test_data: None,
+    executed_queries: list[tuple[str, tuple]],
+) -> None:
+    # given
+    post_service = PostService(session=test_session, read_session=test_session)
+    comment_service = CommentService(session=test_session, read_session=test_session)
+    like_service = LikeService(session=test_session, read_session=test_session)
+    notification_service = NotificationService(
+        session=test_session, read_session=test_session
+    )
+
+    # when
+    await post_service.get_posts_with_counts(page=1, cursor=(datetime(2000, 1, 1), 0))
+    await post_service.get_posts_with_counts(page=2)
+    await post_service.get_post(post_id=1)
+    await post_service.reconcile_post_stats()
+    await comment_service.get_comments(page=1)
+    await comment_service.get_comments(page=1, cursor=(datetime(2000, 1, 1), 0))
+    await comment_service.get_comments(page=1, post_id=1)
+    await comment_service.get_comments(page=1, user_id=1)
+    await like_service.get_like_by_user_and_post(user_id=1, post_id=1)
+    await like_service.get_liked_users(post_id=1)
+    await like_service.get_liked_users()
+    await like_service.get_liked_users(cursor=(datetime(2000, 1, 1), 0))
+    await notification_service.get_notifications_by_user_id(user_id=1)
+    await UserService(session=test_session).get_user_by_nickname("test_user")
+    await UserService(session=test_session).get_user(user_id=1)
+    await ImageService(session=test_session).remove_old_pending_images()
+    await AuthService(session=test_session).purge_expired_sessions()
+    queries = list(executed_queries)
+
+    # then
+    assert queries
+    assert await find_full_scans(test_session, queries) == []
@@ -1,3 +1,4 @@
+import json
 from typing import AsyncGenerator
 
 import pytest
@@ -11,6 +12,7 @@ from src.config import config
 from src.database import get_session
 from src.domains.like import Like
 from src.domains.post import Post
+from src.domains.post_stats import PostStats
 from src.domains.post_view import PostView
 from src.domains.user import User
 from src.main import app
@@ -84,6 +86,100 @@ async def test_create_like_ok(
     assert post.user_id == 1  # type: ignore
 
 
+# 좋아요 추가시 포스트 좋아요 카운터 증가
+@pytest.mark.asyncio
+@pytest.mark.create
+async def test_create_like_increase_like_count(
+    test_client: AsyncClient, test_session: AsyncSession
+) -> None:
+    # given
+    user_result = await test_session.exec(
+        select(User).where(User.nickname == "test_user")
+    )
+    user = user_result.first()
+
+    test_session.add(
+        Post(
+            id=1,
+            author_id=user.id,  # type: ignore
+            title="test_title_1",
+            content="test_content_1",
+        )
+    )
+    test_session.add(PostView(post_id=1))
+    test_session.add(PostStats(post_id=1))
+    await test_session.commit()
+    await test_client.post(
+        "/users/login",
+        json={
+            "nickname": "test_user",
+            "password": "Test_password",
+        },
+    )
+
+    # when
+    response = await test_client.post(
+        "/likes/",
+        json={
+            "post_id": 1,
+        },
+    )
+
+    # then
+    assert response.status_code == 201
+
+    result = await test_session.exec(select(PostStats).where(PostStats.post_id == 1))
+    post_stats = result.first()
+    await test_session.refresh(post_stats)
+    assert post_stats.like_count == 1  # type: ignore
+
+
+# 좋아요 추가시 캐시된 포스트 목록의 좋아요 수 갱신
+@pytest.mark.asyncio
+@pytest.mark.create
+async def test_create_like_refresh_posts_like_count(
+    test_client: AsyncClient, test_session: AsyncSession
+) -> None:
+    # given
+    user_result = await test_session.exec(
+        select(User).where(User.nickname == "test_user")
+    )
+    user = user_result.first()
+
+    test_session.add(
+        Post(
+            id=1,
+            author_id=user.id,  # type: ignore
+            title="test_title_1",
+            content="test_content_1",
+        )
+    )
+    test_session.add(PostView(post_id=1))
+    test_session.add(PostStats(post_id=1))
+    await test_session.commit()
+    await test_client.post(
+        "/users/login",
+        json={
+            "nickname": "test_user",
+            "password": "Test_password",
+        },
+    )
+    before = await test_client.get("/posts/")
+
+    # when
+    await test_client.post(
+        "/likes/",
+        json={
+            "post_id": 1,
+        },
+    )
+    response = await test_client.get("/posts/")
+
+    # then
+    assert before.json()["posts"][0]["like"]["count"] == 0
+    assert response.json()["posts"][0]["like"]["count"] == 1
+
+
 # 존재하지 않는 포스트에 좋아요 추가
 @pytest.mark.asyncio
 @pytest.mark.create
@@ -240,6 +336,64 @@ async def test_get_liked_users_empty_ok(
     assert len(response.json()["users"]) == 0
 
 
+@pytest_asyncio.fixture
+async def liked_post(test_session: AsyncSession) -> int:
+    users = [User(nickname=f"like_user_{i}", password="password") for i in range(25)]
+    test_session.add_all(users)
+    await test_session.commit()
+    test_session.add(
+        Post(id=1, author_id=users[0].id, title="title", content="content")  # type: ignore
+    )
+    await test_session.commit()
+    test_session.add_all(
+        [Like(user_id=user.id, post_id=1) for user in users]  # type: ignore
+    )
+    await test_session.commit()
+
+    return 1
+
+
+# 좋아요 유저 커서 페이지네이션
+@pytest.mark.asyncio
+@pytest.mark.get
+async def test_get_liked_users_cursor_ok(
+    test_client: AsyncClient, liked_post: int
+) -> None:
+    # given
+    first_page = await test_client.get(f"/likes/?post_id={liked_post}")
+    next_link = next(
+        link for link in first_page.json()["links"] if link["rel"] == "next"
+    )
+
+    # when
+    response = await test_client.get(next_link["href"], follow_redirects=True)
+
+    # then
+    assert len(first_page.json()["users"]) == 20
+    assert response.status_code == 200
+    assert len(response.json()["users"]) == 5
+    assert {user["id"] for user in response.json()["users"]}.isdisjoint(
+        user["id"] for user in first_page.json()["users"]
+    )
+
+
+# 좋아요 유저 NDJSON 스트리밍
+@pytest.mark.asyncio
+@pytest.mark.get
+async def test_get_liked_users_stream_ok(
+    test_client: AsyncClient, liked_post: int
+) -> None:
+    # when
+    response = await test_client.get(f"/likes/?post_id={liked_post}&stream=true")
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[0])["nickname"] == "like_user_0"
+
+
 # 존재하지 않는 포스트에 좋아요 유저 조회
 @pytest.mark.asyncio
 @pytest.mark.get
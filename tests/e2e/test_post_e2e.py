@@ -133,6 +133,54 @@ async def test_get_posts_ok(
     assert len(response.json()["posts"]) == 2
 
 
+@pytest.mark.asyncio
+@pytest.mark.posts
+async def test_get_posts_cursor_ok(
+    test_client: AsyncClient, test_session: AsyncSession
+) -> None:
+    # given
+    user_result = await test_session.exec(
+        select(User).where(User.nickname == "test_user")
+    )
+    user = user_result.first()
+    for post_id in range(1, 22):
+        test_session.add(
+            Post(
+                id=post_id,
+                author_id=user.id,
+                title=f"test_title_{post_id}",
+                content=f"test_content_{post_id}",
+            )
+        )
+        test_session.add(PostView(post_id=post_id))
+    await test_session.commit()
+
+    # when
+    first_response = await test_client.get("/posts/")
+    next_link = [
+        link for link in first_response.json()["links"] if link["rel"] == "next"
+    ][0]
+    next_response = await test_client.get(next_link["href"], follow_redirects=True)
+
+    # then
+    assert first_response.status_code == 200
+    assert len(first_response.json()["posts"]) == 20
+    assert next_response.status_code == 200
+    assert [post["id"] for post in next_response.json()["posts"]] == [21]
+    assert not [link for link in next_response.json()["links"] if link["rel"] == "next"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.posts
+async def test_get_posts_invalid_cursor(test_client: AsyncClient) -> None:
+    # when
+    response = await test_client.get("/posts/?cursor=invalid")
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "잘못된 커서입니다"
+
+
 @pytest.mark.asyncio
 @pytest.mark.posts
 async def test_get_posts_empty_ok(
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from redis.exceptions import ConnectionError
+
+from src.auth import hash_password_async, password_hash_metrics, verify_password_async
+from src.config import Config
+from src.domains.login_session import LoginSession
+from src.domains.user import Role
+from src.schemas.auth import SessionContent
+from src.servicies.auth import AuthService
+from src.servicies.session_backend import (
+    DatabaseSessionBackend,
+    SignedSessionBackend,
+    find_verified_user_id,
+)
+
+
+@pytest.fixture
+def session_content() -> SessionContent:
+    return SessionContent(
+        id=1,
+        nickname="test",
+        role=Role.member,
+        expire=datetime.now(tz=timezone.utc) + timedelta(days=1),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_database_session_backend_from_db(
+    mocker, session_content: SessionContent
+) -> None:
+    # Given
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.get.return_value = None
+    service = AsyncMock()
+    service.find_session.return_value = LoginSession(
+        id="session", session_data=session_content.model_dump_json()
+    )
+
+    # When
+    result = await DatabaseSessionBackend(service).get_session_content("session")
+
+    # Then
+    assert result == session_content
+    service.find_session.assert_called_once_with("session")
+    assert 0 < mock_redis.setex.call_args.kwargs["time"] <= 60 * 60 * 24
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_database_session_backend_from_cache(
+    mocker, session_content: SessionContent
+) -> None:
+    # Given
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.get.return_value = session_content.model_dump_json()
+    service = AsyncMock()
+
+    # When
+    result = await DatabaseSessionBackend(service).get_session_content("session")
+
+    # Then
+    assert result == session_content
+    service.find_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_database_session_backend_delete_without_redis(mocker) -> None:
+    # Given
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.delete.side_effect = ConnectionError("Error 111")
+    service = AsyncMock()
+    service.find_session.return_value = LoginSession(id="logout", session_data="{}")
+
+    # When
+    result = await DatabaseSessionBackend(service).delete_session("logout")
+
+    # Then
+    assert result is True
+    service.delete_session.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_find_verified_user_id(mocker, session_content: SessionContent) -> None:
+    # Given
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.get.side_effect = lambda key: (
+        session_content.model_dump_json() if key == "session:verified" else None
+    )
+
+    # When
+    verified = await find_verified_user_id("verified")
+    unknown = await find_verified_user_id("random-cookie")
+
+    # Then
+    assert verified == 1
+    assert unknown is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_signed_session_backend(mocker, session_content: SessionContent) -> None:
+    # Given
+    mocker.patch("src.servicies.session_backend.config.SESSION_SECRET_KEY", "secret")
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.exists.return_value = 0
+    session_backend = SignedSessionBackend()
+    session_id = await session_backend.create_session(
+        content=session_content, expires_delta=timedelta(days=1)
+    )
+
+    # When
+    result = await session_backend.get_session_content(session_id)
+    tampered = await session_backend.get_session_content(session_id[:-2] + "xx")
+
+    # Then
+    assert result
+    assert result.id == session_content.id
+    assert result.role == session_content.role
+    assert tampered is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_signed_session_backend_revoke(
+    mocker, session_content: SessionContent
+) -> None:
+    # Given
+    mocker.patch("src.servicies.session_backend.config.SESSION_SECRET_KEY", "secret")
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    session_backend = SignedSessionBackend()
+    session_id = await session_backend.create_session(
+        content=session_content, expires_delta=timedelta(days=1)
+    )
+
+    # When
+    deleted = await session_backend.delete_session(session_id)
+
+    # Then
+    assert deleted
+    mock_redis.setex.assert_called_once()
+    assert mock_redis.setex.call_args.kwargs["name"].startswith("session:revoked:")
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_hash_and_verify_password_async() -> None:
+    # Given
+    hashed_password = await hash_password_async("Test_password")
+
+    # When
+    valid = await verify_password_async("Test_password", hashed_password)
+    invalid = await verify_password_async("Wrong_password", hashed_password)
+
+    # Then
+    assert valid
+    assert not invalid
+    assert password_hash_metrics.pending == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_hash_password_async_queue_full(mocker) -> None:
+    # Given
+    mocker.patch("src.auth.config.PASSWORD_HASH_MAX_PENDING", 0)
+    rejected = password_hash_metrics.rejected
+
+    # When
+    with pytest.raises(HTTPException) as exc_info:
+        await hash_password_async("Test_password")
+
+    # Then
+    assert exc_info.value.status_code == 503
+    assert password_hash_metrics.rejected == rejected + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_purge_expired_sessions() -> None:
+    # Given
+    session = AsyncMock()
+    session.exec.side_effect = [
+        MagicMock(all=MagicMock(return_value=["a", "b"])),
+        None,
+        MagicMock(all=MagicMock(return_value=["c"])),
+        None,
+    ]
+    auth_service = AuthService(session=session)
+    auth_service.purge_batch_size = 2
+
+    # When
+    purged = await auth_service.purge_expired_sessions()
+
+    # Then
+    assert purged == 3
+    assert session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.parametrize("fail_open", [True, False])
+async def test_signed_session_backend_revocation_redis_down(
+    mocker, session_content: SessionContent, fail_open: bool
+) -> None:
+    # Given
+    mocker.patch("src.servicies.session_backend.config.SESSION_SECRET_KEY", "secret")
+    mocker.patch(
+        "src.servicies.session_backend.config.SESSION_REVOCATION_FAIL_OPEN", fail_open
+    )
+    mock_redis = mocker.patch("src.servicies.session_backend.redis", new=AsyncMock())
+    mock_redis.exists.side_effect = ConnectionError("Error 111")
+    session_backend = SignedSessionBackend()
+    session_id = await session_backend.create_session(
+        content=session_content, expires_delta=timedelta(days=1)
+    )
+
+    # When
+    result = await session_backend.get_session_content(session_id)
+
+    # Then
+    assert (result is not None) == fail_open
+
+
+@pytest.mark.unit
+def test_signed_session_backend_requires_secret_key() -> None:
+    # When, Then
+    with pytest.raises(ValidationError):
+        Config(SESSION_BACKEND="signed", SESSION_SECRET_KEY="")
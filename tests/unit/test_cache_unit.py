@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.cache import LocalCache, get_or_set
+from src.pubsub import _handle
+
+
+@pytest.fixture
+def mock_redis() -> AsyncMock:
+    redis = AsyncMock()
+    redis.get.return_value = None
+    redis.lock = MagicMock(return_value=AsyncMock(acquire=AsyncMock(return_value=True)))
+    return redis
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_or_set_single_flight(mock_redis: AsyncMock) -> None:
+    # Given
+    loader_calls = 0
+
+    async def loader() -> dict:
+        nonlocal loader_calls
+        loader_calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    # When
+    results = await asyncio.gather(
+        *[get_or_set(redis=mock_redis, key="post:1", loader=loader) for _ in range(10)]
+    )
+
+    # Then
+    assert loader_calls == 1
+    assert all(result == {"id": 1} for result in results)
+    mock_redis.setex.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_or_set_cache_hit(mock_redis: AsyncMock) -> None:
+    # Given
+    mock_redis.get.return_value = json.dumps(
+        {"value": {"id": 1}, "delta": 0.0, "expiry": time.time() + 3600}
+    )
+    loader = AsyncMock()
+
+    # When
+    result = await get_or_set(redis=mock_redis, key="post:1", loader=loader)
+
+    # Then
+    assert result == {"id": 1}
+    loader.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_or_set_stale_while_locked(mock_redis: AsyncMock) -> None:
+    # Given
+    mock_redis.get.return_value = json.dumps(
+        {"value": {"id": 1}, "delta": 0.1, "expiry": time.time() - 1}
+    )
+    mock_redis.lock.return_value.acquire.return_value = False
+    loader = AsyncMock()
+
+    # When
+    result = await get_or_set(redis=mock_redis, key="post:1", loader=loader)
+
+    # Then
+    assert result == {"id": 1}
+    loader.assert_not_called()
+
+
+@pytest.mark.unit
+def test_local_cache_lru_eviction() -> None:
+    # Given
+    local_cache = LocalCache(maxsize=2, ttl=60)
+    local_cache.set("posts:page:1", {"page": 1})
+    local_cache.set("posts:page:2", {"page": 2})
+
+    # When
+    local_cache.get("posts:page:1")
+    local_cache.set("post:post_id:1", {"id": 1})
+
+    # Then
+    assert local_cache.get("posts:page:1") == {"page": 1}
+    assert local_cache.get("posts:page:2") is None
+    assert local_cache.get("post:post_id:1") == {"id": 1}
+
+
+@pytest.mark.unit
+def test_local_cache_delete_namespace() -> None:
+    # Given
+    local_cache = LocalCache(maxsize=10, ttl=60)
+    local_cache.set("posts:page:1", {"page": 1})
+    local_cache.set("post:post_id:1", {"id": 1})
+
+    # When
+    local_cache.delete_namespace("posts")
+
+    # Then
+    assert local_cache.get("posts:page:1") is None
+    assert local_cache.get("post:post_id:1") == {"id": 1}
+
+
+@pytest.mark.unit
+def test_local_cache_expired() -> None:
+    # Given
+    local_cache = LocalCache(maxsize=10, ttl=0)
+    local_cache.set("posts:page:1", {"page": 1})
+
+    # When
+    result = local_cache.get("posts:page:1")
+
+    # Then
+    assert result is None
+
+
+@pytest.mark.unit
+def test_pubsub_handler_error_does_not_stop_listener(mocker) -> None:
+    # Given
+    handled: list[str] = []
+
+    def broken_handler(message: str) -> None:
+        raise ValueError(message)
+
+    mocker.patch.dict(
+        "src.pubsub._handlers", {"broken": broken_handler, "ok": handled.append}
+    )
+
+    # When
+    _handle({"channel": "broken", "data": "not json"})
+    _handle({"channel": "ok", "data": "payload"})
+
+    # Then
+    assert handled == ["payload"]
@@ -0,0 +1,37 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.job_lock import acquire_job_lock
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_acquire_job_lock(mocker) -> None:
+    # Given
+    redis_set = mocker.patch("src.job_lock.redis.set", AsyncMock(return_value=True))
+
+    # When
+    result = await acquire_job_lock("post_stats_reconcile", 3600)
+
+    # Then
+    assert result is True
+    redis_set.assert_awaited_once_with(
+        "scheduler:post_stats_reconcile", mocker.ANY, nx=True, ex=3240
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_acquire_job_lock_redis_down(mocker) -> None:
+    # Given
+    mocker.patch(
+        "src.job_lock.redis.set", AsyncMock(side_effect=ConnectionError("down"))
+    )
+
+    # When
+    result = await acquire_job_lock("session_purge", 3600)
+
+    # Then
+    assert result is True
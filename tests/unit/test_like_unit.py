@@ -0,0 +1,147 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.domains.like import Like
+from src.domains.notification import Notification
+from src.servicies.like import LikeService
+
+
+@pytest.fixture
+def mock_session() -> AsyncMock:
+    session = AsyncMock(spec=AsyncSession)
+    session.add = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def like_service(mock_session: AsyncMock) -> LikeService:
+    return LikeService(session=mock_session, read_session=mock_session)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_create_like(mock_session: AsyncMock, like_service: LikeService) -> None:
+    # When
+    result = await like_service.create_like(user_id=1, post_id=2, target_user_id=5)
+
+    # Then
+    assert isinstance(result, Like)
+    assert (result.user_id, result.post_id) == (1, 2)
+    mock_session.flush.assert_awaited_once()
+    like, notification = [call.args[0] for call in mock_session.add.call_args_list]
+    assert like is result
+    assert isinstance(notification, Notification)
+    assert notification.target_user_id == 5
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_awaited_once_with(result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_create_like_duplicate(
+    mock_session: AsyncMock, like_service: LikeService
+) -> None:
+    # Given
+    mock_session.flush.side_effect = IntegrityError("", {}, Exception())
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=5))
+
+    # When
+    result = await like_service.create_like(user_id=1, post_id=2, target_user_id=5)
+
+    # Then
+    assert result is None
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_create_like_missing_post(
+    mock_session: AsyncMock, like_service: LikeService
+) -> None:
+    # Given
+    mock_session.flush.side_effect = IntegrityError("", {}, Exception())
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=None))
+
+    # When, Then
+    with pytest.raises(IntegrityError):
+        await like_service.create_like(user_id=1, post_id=2, target_user_id=5)
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_like_by_user_and_post_not_liked_from_cache(
+    mocker, mock_session: AsyncMock, like_service: LikeService
+) -> None:
+    # Given
+    mocker.patch("src.servicies.like.config.LIKE_CACHE_ENABLED", True)
+    mocker.patch("src.servicies.like.is_liker", AsyncMock(return_value=False))
+
+    # When
+    result = await like_service.get_like_by_user_and_post(user_id=1, post_id=2)
+
+    # Then
+    assert result is None
+    mock_session.exec.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_like_counts_load_cold_posts(
+    mocker, mock_session: AsyncMock, like_service: LikeService
+) -> None:
+    # Given
+    mocker.patch("src.servicies.like.count_likers", AsyncMock(return_value={1: 3}))
+    versions = {2: "4", 3: "0"}
+    mocker.patch(
+        "src.servicies.like.get_likers_versions", AsyncMock(return_value=versions)
+    )
+    load_likers = mocker.patch("src.servicies.like.load_likers", AsyncMock())
+    mock_session.exec.return_value = MagicMock(
+        all=MagicMock(return_value=[(2, 10), (2, 11)])
+    )
+
+    # When
+    result = await like_service.get_like_counts([1, 2, 3])
+
+    # Then
+    assert result == {1: 3, 2: 2, 3: 0}
+    load_likers.assert_awaited_once_with({2: {10, 11}, 3: set()}, versions)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_like_by_user_and_post_read_version_before_rebuild(
+    mocker, mock_session: AsyncMock, like_service: LikeService
+) -> None:
+    # Given
+    mocker.patch("src.servicies.like.config.LIKE_CACHE_ENABLED", True)
+    mocker.patch("src.servicies.like.is_liker", AsyncMock(return_value=None))
+    calls: list[str] = []
+
+    async def get_likers_versions(post_ids: list[int]) -> dict[int, str]:
+        calls.append("version")
+        return {2: "0"}
+
+    async def exec(query) -> MagicMock:
+        calls.append("select")
+        return MagicMock(
+            all=MagicMock(return_value=[]), first=MagicMock(return_value=None)
+        )
+
+    mocker.patch("src.servicies.like.get_likers_versions", get_likers_versions)
+    mocker.patch("src.servicies.like.load_likers", AsyncMock())
+    mock_session.exec.side_effect = exec
+
+    # When
+    result = await like_service.get_like_by_user_and_post(user_id=1, post_id=2)
+
+    # Then
+    assert result is None
+    assert calls == ["version", "select"]
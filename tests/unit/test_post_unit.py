@@ -20,12 +20,14 @@ def mock_session() -> AsyncMock:
 
 @pytest.fixture
 def post_service(mock_session: AsyncMock) -> PostService:
-    return PostService(session=mock_session)
+    return PostService(session=mock_session, read_session=mock_session)
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_create_post(mocker, post_service: PostService) -> None:
+async def test_create_post(
+    mocker, mock_session: AsyncMock, post_service: PostService
+) -> None:
     # Given
     mocker.patch("src.domains.comment.Comment")
     user_id = 1
@@ -40,50 +42,69 @@ async def test_create_post(mocker, post_service: PostService) -> None:
     assert result.author_id == 1
     assert result.title == "테스트 제목"
     assert result.content == "테스트 내용"
+    assert result.post_view and result.post_stats
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_get_posts(mock_session: AsyncMock, post_service: PostService) -> None:
+async def test_get_posts_with_counts(
+    mock_session: AsyncMock, post_service: PostService
+) -> None:
     # Given
-    mock_posts = [
-        Post(
+    mock_rows = [
+        MagicMock(
             id=1,
             title="테스트 제목 1",
-            content="테스트 내용 1",
-            user=User(id=1, nickname="테스트 닉네임1"),
+            author="테스트 닉네임1",
+            comment_count=3,
+            like_count=2,
+            view_count=10,
         ),
-        Post(
+        MagicMock(
             id=2,
             title="테스트 제목 2",
-            content="테스트 내용 2",
-            user=User(id=1, nickname="테스트 닉네임1"),
-        ),
-        Post(
-            id=3,
-            title="테스트 제목 3",
-            content="테스트 내용 3",
-            user=User(id=1, nickname="테스트 닉네임1"),
+            author="테스트 닉네임1",
+            comment_count=0,
+            like_count=0,
+            view_count=0,
         ),
     ]
     mock_result = MagicMock()
-    mock_result.all.return_value = mock_posts
+    mock_result.all.return_value = mock_rows
     mock_session.exec.return_value = mock_result
 
     # When
-    result = await post_service.get_posts(page=1)
+    result = await post_service.get_posts_with_counts(page=1)
 
     # Then
-    assert isinstance(result[0], Post)
-    assert len(result) == 3
-    assert result[0].title == "테스트 제목 1"
-    assert result[0].content == "테스트 내용 1"
-    assert isinstance(result[0].user, User)
+    assert len(result) == 2
+    assert result[0].author == "테스트 닉네임1"
+    assert result[0].comment_count == 3
+    assert result[0].like_count == 2
+    assert result[0].view_count == 10
 
     mock_session.exec.assert_called_once()
     mock_result.all.assert_called_once()
 
 
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_posts_with_counts_primary(mock_session: AsyncMock) -> None:
+    # Given
+    read_session = AsyncMock(spec=AsyncSession)
+    post_service = PostService(session=mock_session, read_session=read_session)
+    mock_session.exec.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    # When
+    await post_service.get_posts_with_counts(page=1, primary=True)
+
+    # Then
+    mock_session.exec.assert_awaited_once()
+    read_session.exec.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_get_post(mock_session: AsyncMock, post_service: PostService) -> None:
@@ -145,3 +166,25 @@ async def test_delete_post(mock_session: AsyncMock, post_service: PostService) -
     assert result is None
 
     mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_flush_post_views(
+    mock_session: AsyncMock, post_service: PostService
+) -> None:
+    # Given
+    view_counts = {1: 3, 2: 1}
+
+    # When
+    result = await post_service.flush_post_views(view_counts)  # type: ignore
+
+    # Then
+    assert result is None
+
+    mock_session.exec.assert_called_once()
+    assert mock_session.exec.call_args.kwargs["params"] == [
+        {"b_post_id": 1, "b_count": 3},
+        {"b_post_id": 2, "b_count": 1},
+    ]
+    mock_session.commit.assert_called_once()
@@ -0,0 +1,137 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.config import config
+from src.middlewares.rate_limit import (
+    Lease,
+    LeaseStore,
+    RateLimitPolicies,
+    RateLimitPolicy,
+    get_bucket_key,
+)
+
+
+@pytest.mark.unit
+def test_lease_store_acquire_until_exhausted() -> None:
+    # Given
+    lease_store = LeaseStore(maxsize=10, ttl=5.0)
+    lease_store.add(
+        "bucket:127.0.0.1", Lease(tokens=2, remaining=3, retry_after=0, ttl=5.0)
+    )
+
+    # When
+    leases = [lease_store.acquire("bucket:127.0.0.1") for _ in range(3)]
+
+    # Then
+    assert leases[0] and leases[1]
+    assert leases[1].tokens == 0
+    assert leases[2] is None
+
+
+@pytest.mark.unit
+def test_lease_store_expired_lease() -> None:
+    # Given
+    lease_store = LeaseStore(maxsize=10, ttl=0.0)
+    lease_store.add(
+        "bucket:127.0.0.1", Lease(tokens=5, remaining=0, retry_after=0, ttl=0.0)
+    )
+
+    # When
+    lease = lease_store.acquire("bucket:127.0.0.1")
+
+    # Then
+    assert lease is None
+
+
+@pytest.mark.unit
+def test_lease_store_evict_least_recently_used() -> None:
+    # Given
+    lease_store = LeaseStore(maxsize=2, ttl=5.0)
+    for client_ip in ["1.1.1.1", "2.2.2.2", "3.3.3.3"]:
+        lease_store.add(
+            f"bucket:{client_ip}", Lease(tokens=5, remaining=0, retry_after=0, ttl=5.0)
+        )
+
+    # When
+    lease = lease_store.acquire("bucket:1.1.1.1")
+
+    # Then
+    assert lease is None
+    assert len(lease_store.leases) == 2
+
+
+@pytest.mark.unit
+def test_rate_limit_policies_match() -> None:
+    # Given
+    policies = RateLimitPolicies()
+
+    # When
+    login = policies.match("POST", "/users/login")
+    upload = policies.match("POST", "/images/profile/")
+    read = policies.match("GET", "/posts/1")
+    write = policies.match("PATCH", "/posts/1")
+
+    # Then
+    assert login.name == "login"
+    assert upload.name == "upload"
+    assert read.name == "read"
+    assert write.name == "write"
+
+
+@pytest.mark.unit
+def test_rate_limit_policy_lease_size() -> None:
+    # When
+    small = RateLimitPolicy(name="login", requests_per_minute=10, bucket_size=5.0)
+    medium = RateLimitPolicy(name="read", requests_per_minute=60, bucket_size=30.0)
+    large = RateLimitPolicy(name="read", requests_per_minute=60, bucket_size=1000.0)
+
+    # Then
+    assert small.lease_size == 1
+    assert medium.lease_size == 3
+    assert large.lease_size == config.RATE_LIMIT_LEASE_SIZE
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_bucket_key_by_verified_user(mocker) -> None:
+    # Given
+    mocker.patch(
+        "src.middlewares.rate_limit.find_verified_user_id", AsyncMock(return_value=7)
+    )
+    policies = RateLimitPolicies()
+    scope = {
+        "type": "http",
+        "client": ("127.0.0.1", 12345),
+        "headers": [(b"cookie", b"session_id=abc")],
+    }
+
+    # When
+    write_key = await get_bucket_key(scope, policies.write)
+    read_key = await get_bucket_key(scope, policies.read)
+
+    # Then
+    assert write_key == "bucket:write:user:7"
+    assert read_key == "bucket:read:ip:127.0.0.1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_bucket_key_unverified_session(mocker) -> None:
+    # Given
+    mocker.patch(
+        "src.middlewares.rate_limit.find_verified_user_id",
+        AsyncMock(return_value=None),
+    )
+    policies = RateLimitPolicies()
+    scope = {
+        "type": "http",
+        "client": ("127.0.0.1", 12345),
+        "headers": [(b"cookie", b"session_id=random")],
+    }
+
+    # When
+    write_key = await get_bucket_key(scope, policies.write)
+
+    # Then
+    assert write_key == "bucket:write:ip:127.0.0.1"
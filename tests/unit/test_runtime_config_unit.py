@@ -0,0 +1,30 @@
+import pytest
+
+from src.config import config
+from src.database import consistent_hash
+from src.middlewares.rate_limit import rate_limit_policies
+from src.runtime_config import apply_runtime_config
+
+
+@pytest.mark.unit
+def test_apply_runtime_config() -> None:
+    # Given
+    origin = (config.REQUESTS_PER_MINUTE, config.BUCKET_SIZE, config.VIRTUAL_NODES)
+    values = {"REQUESTS_PER_MINUTE": "120", "BUCKET_SIZE": "20", "VIRTUAL_NODES": "10"}
+
+    # When
+    apply_runtime_config(values)
+
+    # Then
+    try:
+        assert config.REQUESTS_PER_MINUTE == 120
+        assert rate_limit_policies.read.bucket_size == 20.0
+        assert consistent_hash.virtual_nodes == 10
+    finally:
+        apply_runtime_config(
+            {
+                "REQUESTS_PER_MINUTE": origin[0],
+                "BUCKET_SIZE": origin[1],
+                "VIRTUAL_NODES": origin[2],
+            }
+        )
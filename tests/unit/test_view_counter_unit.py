@@ -0,0 +1,40 @@
+import pytest
+
+from src.view_counter import PostViewBuffer
+
+
+@pytest.mark.unit
+def test_post_view_buffer_drain() -> None:
+    # Given
+    post_view_buffer = PostViewBuffer()
+    post_view_buffer.add(post_id=1, viewer="127.0.0.1")
+    post_view_buffer.add(post_id=1, viewer="127.0.0.1")
+    post_view_buffer.add(post_id=2, viewer="session_id")
+
+    # When
+    view_counts = post_view_buffer.drain_counts()
+    viewers = post_view_buffer.drain_viewers()
+
+    # Then
+    assert view_counts == {1: 2, 2: 1}
+    assert [post_viewers for (post_id, _), post_viewers in viewers.items()] == [
+        {"127.0.0.1"},
+        {"session_id"},
+    ]
+    assert post_view_buffer.drain_counts() == {}
+    assert post_view_buffer.drain_viewers() == {}
+
+
+@pytest.mark.unit
+def test_post_view_buffer_restore() -> None:
+    # Given
+    post_view_buffer = PostViewBuffer()
+    post_view_buffer.add(post_id=1, viewer="127.0.0.1")
+    view_counts = post_view_buffer.drain_counts()
+    post_view_buffer.add(post_id=1, viewer="127.0.0.1")
+
+    # When
+    post_view_buffer.restore_counts(view_counts)
+
+    # Then
+    assert post_view_buffer.drain_counts() == {1: 2}